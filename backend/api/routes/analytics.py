@@ -181,13 +181,11 @@ async def get_vehicle_type_distribution(
             |> sum()
         '''
         
-        results = influxdb.query_data(query)
-        
         # Process results into a distribution
         vehicle_counts = {}
         total_count = 0
         
-        for record in results:
+        for record in influxdb.query_data_iter(query):
             vehicle_type = record.get("vehicle_type", "unknown")
             count = float(record.get("_value", 0))
             
@@ -232,11 +230,9 @@ async def get_system_overview():
             |> last()
         '''
         
-        results = influxdb.query_data(query)
-        
         # Extract metrics
         metrics = {}
-        for record in results:
+        for record in influxdb.query_data_iter(query):
             field = record.get("_field", "")
             value = record.get("_value", 0)
             metrics[field] = value
@@ -4,7 +4,7 @@ Handles ML-based traffic prediction and optimization
 """
 from fastapi import APIRouter, HTTPException, Body
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pydantic import BaseModel
 import json
 import requests
@@ -41,18 +41,16 @@ async def predict_traffic_flow(request: PredictionRequest):
     """
     try:
         # Get current system settings
-        settings = redis.get("system:settings")
+        settings = redis.get_value("system:settings")
         if not settings:
+            # Settings are stored one JSON-encoded value per key
+            settings = {"ml_model_type": "edge_impulse", "optimization_algorithm": "afsa"}
             with postgres.get_session() as session:
                 from database.models.postgres_models import SystemSettings
-                db_settings = session.query(SystemSettings).order_by(SystemSettings.created_at.desc()).first()
-                if db_settings:
-                    settings = {
-                        "ml_model_type": db_settings.ml_model_type,
-                        "optimization_algorithm": db_settings.optimization_algorithm
-                    }
-                else:
-                    settings = {"ml_model_type": "edge_impulse", "optimization_algorithm": "afsa"}
+                rows = session.query(SystemSettings).filter(
+                    SystemSettings.key.in_(list(settings))
+                ).all()
+                settings.update((row.key, json.loads(row.value)) for row in rows)
         
         # Get historical data for prediction
         start_time = datetime.utcnow() - timedelta(hours=24)
@@ -135,10 +133,20 @@ async def optimize_timing(request: OptimizationRequest):
                 raise HTTPException(status_code=404, detail=f"Intersection {request.intersection_id} not found")
                 
             signals = session.query(Signal).filter(Signal.intersection_id == request.intersection_id).all()
-            current_timing = session.query(TimingPlan).filter(
-                TimingPlan.intersection_id == request.intersection_id,
+            
+            # Timing plans belong to signals; keep the highest-priority active plan of each
+            timing_plans = session.query(TimingPlan).filter(
+                TimingPlan.signal_id.in_([s.id for s in signals]),
                 TimingPlan.is_active == True
-            ).first()
+            ).order_by(TimingPlan.priority.desc()).all()
+            
+            current_timing = {}
+            for plan in timing_plans:
+                current_timing.setdefault(str(plan.signal_id), {
+                    "green_time": plan.green_time,
+                    "yellow_time": plan.yellow_time,
+                    "red_time": plan.red_time
+                })
             
         # Get recent traffic data
         start_time = datetime.utcnow() - timedelta(hours=6)
@@ -157,9 +165,9 @@ async def optimize_timing(request: OptimizationRequest):
         # Prepare optimization input
         optimization_input = {
             "intersection_id": request.intersection_id,
-            "intersection_type": intersection.intersection_type,
-            "signals": [{"id": s.id, "direction": s.direction, "current_status": s.current_status} for s in signals],
-            "current_timing": json.loads(current_timing.timing_data) if current_timing else {},
+            "intersection_type": intersection.type,
+            "signals": [{"id": str(s.id), "position": s.position, "current_status": s.current_status} for s in signals],
+            "current_timing": current_timing,
             "recent_data": recent_data,
             "algorithm": request.algorithm,
             "parameters": request.parameters or {}
@@ -215,11 +223,10 @@ async def optimize_timing(request: OptimizationRequest):
             
             # Create new optimization run record
             new_run = OptimizationRun(
-                intersection_id=request.intersection_id,
                 algorithm=request.algorithm,
-                parameters=json.dumps(request.parameters) if request.parameters else None,
-                result_data=json.dumps(optimization_result),
-                created_at=datetime.utcnow()
+                start_time=datetime.now(timezone.utc),
+                parameters=request.parameters,
+                results=optimization_result
             )
             
             session.add(new_run)
@@ -337,20 +344,21 @@ async def get_optimization_history(intersection_id: str):
         with postgres.get_session() as session:
             from database.models.postgres_models import OptimizationRun
             
+            # Runs are matched on the intersection recorded in their results,
+            # which the GIN index on results serves
             runs = session.query(OptimizationRun).filter(
-                OptimizationRun.intersection_id == intersection_id
-            ).order_by(OptimizationRun.created_at.desc()).limit(10).all()
+                OptimizationRun.results.contains({"intersection_id": intersection_id})
+            ).order_by(OptimizationRun.start_time.desc()).limit(10).all()
             
             history = []
             for run in runs:
-                result_data = json.loads(run.result_data)
                 history.append({
                     "run_id": run.id,
-                    "intersection_id": run.intersection_id,
+                    "intersection_id": intersection_id,
                     "algorithm": run.algorithm,
-                    "parameters": json.loads(run.parameters) if run.parameters else None,
-                    "created_at": run.created_at.isoformat(),
-                    "estimated_improvements": result_data.get("estimated_improvements", {})
+                    "parameters": run.parameters,
+                    "created_at": run.start_time.isoformat(),
+                    "estimated_improvements": run.results.get("estimated_improvements", {})
                 })
                 
             return {
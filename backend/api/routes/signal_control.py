@@ -8,7 +8,7 @@ Handles traffic signal control operations including:
 """
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 
 from database.connectors.postgres_connector import PostgresConnector
@@ -45,12 +45,12 @@ async def get_intersection_status(intersection_id: str):
                 
             status = {
                 "intersection_id": intersection_id,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "signals": [
                     {
-                        "id": signal.id,
+                        "id": str(signal.id),
                         "position": signal.position,
-                        "status": signal.current_status.value,
+                        "status": signal.current_status,
                         "last_changed": signal.last_status_change.isoformat()
                     }
                     for signal in signals
@@ -84,8 +84,8 @@ async def update_signal_status(
             if not signal:
                 raise HTTPException(status_code=404, detail="Signal not found")
                 
-            signal.current_status = status
-            signal.last_status_change = datetime.utcnow()
+            signal.current_status = status.value
+            signal.last_status_change = datetime.now(timezone.utc)
             
             # Publish update to MQTT for edge devices
             background_tasks.add_task(
@@ -99,9 +99,9 @@ async def update_signal_status(
             redis.delete_key(f"intersection:{intersection_id}:status")
             
             return {
-                "id": signal.id,
+                "id": str(signal.id),
                 "position": signal.position,
-                "status": signal.current_status.value,
+                "status": signal.current_status,
                 "last_changed": signal.last_status_change.isoformat()
             }
     except Exception as e:
@@ -175,7 +175,7 @@ async def emergency_vehicle_priority(
             "vehicle_type": vehicle_type,
             "eta_seconds": eta_seconds,
             "priority_level": priority_level,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
         
         # Store in Redis with expiration
@@ -211,7 +211,7 @@ async def coordinate_green_wave(
     Coordinate green wave along a corridor
     """
     if not start_time:
-        start_time = datetime.utcnow()
+        start_time = datetime.now(timezone.utc)
         
     try:
         # Validate intersections exist
@@ -268,7 +268,7 @@ async def publish_signal_change(intersection_id: str, signal_id: str, status: st
         "intersection_id": intersection_id,
         "signal_id": signal_id,
         "status": status,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
     
     # This would typically use an MQTT client
@@ -4,8 +4,9 @@ Handles system settings, configuration, and management
 """
 from fastapi import APIRouter, HTTPException, Depends, Body
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from pydantic import BaseModel
+import json
 
 from database.connectors.postgres_connector import PostgresConnector
 from database.connectors.redis_connector import RedisConnector
@@ -30,6 +31,34 @@ class SystemSettingsModel(BaseModel):
     api_endpoint: Optional[str] = None
     notification_email: Optional[str] = None
 
+# System settings are stored one JSON-encoded value per key
+SETTINGS_KEYS = (
+    "ml_model_type",
+    "optimization_algorithm",
+    "emergency_vehicle_priority",
+    "green_wave_coordination",
+    "data_retention_days",
+    "api_endpoint",
+    "notification_email",
+)
+SETTINGS_CACHE_KEY = "system:settings"
+
+def settings_from_rows(rows: List[SystemSettings]) -> Dict[str, Any]:
+    """
+    Decode key/value settings rows into the settings payload
+    
+    Args:
+        rows: SystemSettings rows
+        
+    Returns:
+        Dictionary of decoded settings plus their latest update time
+    """
+    values = dict.fromkeys(SETTINGS_KEYS)
+    values.update((row.key, json.loads(row.value)) for row in rows)
+    updated = [row.updated_at for row in rows if row.updated_at]
+    values["updated_at"] = max(updated).isoformat() if updated else None
+    return values
+
 class UserModel(BaseModel):
     username: str
     email: str
@@ -43,34 +72,27 @@ async def get_system_settings():
     """
     try:
         # Try to get from Redis cache first
-        cached_settings = redis.get("system:settings")
+        cached_settings = redis.get_value(SETTINGS_CACHE_KEY)
         if cached_settings:
             return cached_settings
             
         # If not in cache, get from PostgreSQL
         with postgres.get_session() as session:
-            settings = session.query(SystemSettings).order_by(SystemSettings.created_at.desc()).first()
+            rows = session.query(SystemSettings).filter(
+                SystemSettings.key.in_(SETTINGS_KEYS)
+            ).all()
             
-            if not settings:
+            if not rows:
                 raise HTTPException(status_code=404, detail="System settings not found")
                 
-            # Cache the settings
-            settings_dict = {
-                "id": settings.id,
-                "ml_model_type": settings.ml_model_type,
-                "optimization_algorithm": settings.optimization_algorithm,
-                "emergency_vehicle_priority": settings.emergency_vehicle_priority,
-                "green_wave_coordination": settings.green_wave_coordination,
-                "data_retention_days": settings.data_retention_days,
-                "api_endpoint": settings.api_endpoint,
-                "notification_email": settings.notification_email,
-                "created_at": settings.created_at.isoformat(),
-                "updated_at": settings.updated_at.isoformat() if settings.updated_at else None
-            }
+            settings_dict = settings_from_rows(rows)
             
-            redis.set("system:settings", settings_dict, expire=3600)  # Cache for 1 hour
-            
-            return settings_dict
+        # Cache the settings
+        redis.set_value(SETTINGS_CACHE_KEY, settings_dict, expiry=3600)  # Cache for 1 hour
+        
+        return settings_dict
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving system settings: {str(e)}")
 
@@ -80,49 +102,47 @@ async def update_system_settings(settings: SystemSettingsModel):
     Update system settings
     """
     try:
+        values = {key: getattr(settings, key) for key in SETTINGS_KEYS}
+        
         with postgres.get_session() as session:
-            # Create new settings record
-            new_settings = SystemSettings(
-                ml_model_type=settings.ml_model_type,
-                optimization_algorithm=settings.optimization_algorithm,
-                emergency_vehicle_priority=settings.emergency_vehicle_priority,
-                green_wave_coordination=settings.green_wave_coordination,
-                data_retention_days=settings.data_retention_days,
-                api_endpoint=settings.api_endpoint,
-                notification_email=settings.notification_email,
-                created_at=datetime.utcnow()
-            )
-            
-            session.add(new_settings)
-            session.commit()
-            
-            # Update Redis cache
-            settings_dict = {
-                "id": new_settings.id,
-                "ml_model_type": new_settings.ml_model_type,
-                "optimization_algorithm": new_settings.optimization_algorithm,
-                "emergency_vehicle_priority": new_settings.emergency_vehicle_priority,
-                "green_wave_coordination": new_settings.green_wave_coordination,
-                "data_retention_days": new_settings.data_retention_days,
-                "api_endpoint": new_settings.api_endpoint,
-                "notification_email": new_settings.notification_email,
-                "created_at": new_settings.created_at.isoformat(),
-                "updated_at": new_settings.updated_at.isoformat() if new_settings.updated_at else None
+            existing = {
+                row.key: row
+                for row in session.query(SystemSettings).filter(
+                    SystemSettings.key.in_(SETTINGS_KEYS)
+                ).all()
             }
             
-            redis.set("system:settings", settings_dict, expire=3600)  # Cache for 1 hour
-            
-            # Publish settings update event
-            redis.publish("system:events", {
-                "type": "settings_updated",
-                "data": settings_dict
-            })
+            # One row per setting; unset optional settings drop their row
+            new_rows = []
+            for key, value in values.items():
+                row = existing.get(key)
+                if value is None:
+                    if row is not None:
+                        session.delete(row)
+                elif row is not None:
+                    row.value = json.dumps(value)
+                else:
+                    new_rows.append(SystemSettings(key=key, value=json.dumps(value)))
+                    
+            session.add_all(new_rows)
+            session.commit()
             
-            return {
-                "status": "success",
-                "message": "System settings updated successfully",
-                "settings": settings_dict
-            }
+        settings_dict = {**values, "updated_at": datetime.now(timezone.utc).isoformat()}
+        
+        # Update Redis cache
+        redis.set_value(SETTINGS_CACHE_KEY, settings_dict, expiry=3600)  # Cache for 1 hour
+        
+        # Publish settings update event
+        redis.publish_message("system:events", {
+            "type": "settings_updated",
+            "data": settings_dict
+        })
+        
+        return {
+            "status": "success",
+            "message": "System settings updated successfully",
+            "settings": settings_dict
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating system settings: {str(e)}")
 
@@ -207,18 +227,15 @@ async def create_user(user: UserModel):
             if existing_user:
                 raise HTTPException(status_code=400, detail="Username already exists")
                 
-            # Create new user
+            # Create new user; created_at is filled in by the database
             new_user = User(
                 username=user.username,
                 email=user.email,
-                role=user.role,
-                created_at=datetime.utcnow()
+                # In a real system, you would hash the password here
+                password_hash=f"hashed_{user.password}" if user.password else None,
+                role=user.role
             )
             
-            if user.password:
-                # In a real system, you would hash the password here
-                new_user.password_hash = f"hashed_{user.password}"
-                
             session.add(new_user)
             session.commit()
             
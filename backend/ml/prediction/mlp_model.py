@@ -12,6 +12,13 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import r2_score
 import joblib
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# Fixed batch size the inference function is traced for
+INFERENCE_BATCH = 32
 
 class TrafficPredictionMLP:
     """
@@ -31,20 +38,25 @@ class TrafficPredictionMLP:
         self.hidden_layers = hidden_layers
         self.dropout_rate = dropout_rate
         self.model = None
+        self._infer = None
+        self._onnx_session = None
         self.scaler = StandardScaler()
         
     def build_model(self):
         """
         Build the MLP neural network architecture.
         """
+        # Round layer widths up to multiples of 8 so matmul dimensions stay aligned
+        hidden_layers = [-(-units // 8) * 8 for units in self.hidden_layers]
+        
         model = Sequential()
         
         # Input layer
-        model.add(Dense(self.hidden_layers[0], activation='relu', input_dim=self.input_dim))
+        model.add(Dense(hidden_layers[0], activation='relu', input_dim=self.input_dim))
         model.add(Dropout(self.dropout_rate))
         
         # Hidden layers
-        for units in self.hidden_layers[1:]:
+        for units in hidden_layers[1:]:
             model.add(Dense(units, activation='relu'))
             model.add(Dropout(self.dropout_rate))
         
@@ -59,8 +71,25 @@ class TrafficPredictionMLP:
         )
         
         self.model = model
+        self._build_inference_fn()
         return model
     
+    def _build_inference_fn(self):
+        """
+        Compile a single XLA inference function for the current model.
+        
+        Calling the model through a fixed-signature tf.function avoids the
+        per-call dispatch and tf.data setup of Model.predict, and lets XLA
+        fuse the dense/activation layers. The batch dimension is pinned to
+        INFERENCE_BATCH so the function is traced exactly once.
+        """
+        model = self.model
+        self._infer = tf.function(
+            lambda x: model(x, training=False),
+            jit_compile=True,
+            input_signature=[tf.TensorSpec([INFERENCE_BATCH, self.input_dim], tf.float32)]
+        )
+    
     def train(self, X_train, y_train, epochs=100, batch_size=32, validation_split=0.2):
         """
         Train the MLP model.
@@ -107,10 +136,87 @@ class TrafficPredictionMLP:
             raise ValueError("Model not trained. Call train() first.")
             
         # Normalize input data
-        X_scaled = self.scaler.transform(X)
+        X_scaled = self.scaler.transform(X).astype(np.float32)
+        n_samples = X_scaled.shape[0]
         
-        # Make predictions
-        return self.model.predict(X_scaled)
+        # Pad to a whole number of fixed-size batches and run them through the
+        # single traced inference function
+        n_batches = max(1, -(-n_samples // INFERENCE_BATCH))
+        padded = np.zeros((n_batches * INFERENCE_BATCH, self.input_dim), dtype=np.float32)
+        padded[:n_samples] = X_scaled
+        
+        outputs = [
+            self._infer(tf.constant(padded[i:i + INFERENCE_BATCH])).numpy()
+            for i in range(0, padded.shape[0], INFERENCE_BATCH)
+        ]
+        return np.concatenate(outputs)[:n_samples]
+    
+    def export_onnx(self, onnx_path, quantize=False):
+        """
+        Export the trained model to ONNX for serving with ONNX Runtime.
+        
+        Args:
+            onnx_path: Path to write the ONNX model
+            quantize: If True, also apply dynamic INT8 weight quantization
+            
+        Returns:
+            Path of the exported model
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+            
+        # Imported lazily so the exporters are only needed where models are converted
+        import tf2onnx
+        
+        os.makedirs(os.path.dirname(onnx_path) or ".", exist_ok=True)
+        
+        input_signature = (tf.TensorSpec([None, self.input_dim], tf.float32, name="input"),)
+        tf2onnx.convert.from_keras(
+            self.model,
+            input_signature=input_signature,
+            opset=17,
+            output_path=onnx_path
+        )
+        
+        if quantize:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            quantize_dynamic(onnx_path, onnx_path, weight_type=QuantType.QInt8)
+            
+        return onnx_path
+    
+    def load_onnx(self, onnx_path):
+        """
+        Load an exported ONNX model into an ONNX Runtime session.
+        
+        Args:
+            onnx_path: Path to the ONNX model
+        """
+        import onnxruntime as ort
+        
+        self._onnx_session = ort.InferenceSession(
+            onnx_path,
+            providers=['CPUExecutionProvider']
+        )
+        return self
+    
+    def predict_onnx(self, X):
+        """
+        Make traffic density predictions with ONNX Runtime.
+        
+        Args:
+            X: Input features
+            
+        Returns:
+            Predicted traffic density
+        """
+        if self._onnx_session is None:
+            raise ValueError("ONNX model not loaded. Call load_onnx() first.")
+            
+        # Normalize input data
+        X_scaled = self.scaler.transform(X).astype(np.float32)
+        
+        input_name = self._onnx_session.get_inputs()[0].name
+        return self._onnx_session.run(None, {input_name: X_scaled})[0]
     
     def evaluate(self, X_test, y_test):
         """
@@ -132,10 +238,14 @@ class TrafficPredictionMLP:
         # Make predictions
         y_pred = self.model.predict(X_test_scaled)
         
-        # Calculate metrics
-        mse = np.mean((y_pred - y_test) ** 2)
-        mae = np.mean(np.abs(y_pred - y_test))
-        r2 = r2_score(y_test, y_pred)
+        # Calculate metrics from a single flattened residual array
+        y_true = np.asarray(y_test, dtype=np.float32).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float32).ravel()
+        residuals = y_pred - y_true
+        
+        mse = float(residuals @ residuals) / residuals.size
+        mae = float(np.abs(residuals).mean())
+        r2 = r2_score(y_true, y_pred)
         
         return {
             'mse': mse,
@@ -174,9 +284,123 @@ class TrafficPredictionMLP:
         """
         # Load model
         self.model = tf.keras.models.load_model(model_path)
+        self._build_inference_fn()
         
         # Load scaler
         if scaler_path:
             self.scaler = joblib.load(scaler_path)
             
-        return self
\ No newline at end of file
+        return self
+
+
+class PredictionBatcher:
+    """
+    Collects single-sample prediction requests into fixed-size batches.
+    
+    Requests are flushed to the model when INFERENCE_BATCH samples are
+    waiting or when the oldest one has waited max_wait_ms, whichever comes
+    first.
+    """
+    
+    def __init__(self, model, max_wait_ms=5):
+        """
+        Initialize the batcher.
+        
+        Args:
+            model: Trained TrafficPredictionMLP
+            max_wait_ms: Maximum time a request waits for a batch to fill
+        """
+        self.model = model
+        self.max_wait = max_wait_ms / 1000.0
+        self._requests = queue.Queue()
+        self._lock = threading.Lock()
+        self._running = True
+        self._worker = threading.Thread(target=self._run)
+        self._worker.daemon = True
+        self._worker.start()
+    
+    def submit(self, x):
+        """
+        Queue one sample for prediction.
+        
+        Args:
+            x: Input features for a single sample
+            
+        Returns:
+            Future resolving to the predicted traffic density
+            
+        Raises:
+            RuntimeError: If the batcher has been closed
+        """
+        future = Future()
+        with self._lock:
+            if not self._running:
+                raise RuntimeError("PredictionBatcher is closed")
+            self._requests.put((np.asarray(x, dtype=np.float32).reshape(-1), future))
+        return future
+    
+    def close(self):
+        """
+        Stop the background worker and cancel requests it did not pick up.
+        
+        A batch already being predicted still completes; futures left in the
+        queue are cancelled so callers waiting on them do not hang.
+        """
+        with self._lock:
+            self._running = False
+        self._worker.join(timeout=2.0)
+        
+        while True:
+            try:
+                _, future = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            future.cancel()
+    
+    def _run(self):
+        """Background thread that drains the request queue in batches"""
+        while self._running:
+            try:
+                batch = self._take(timeout=0.1)
+            except queue.Empty:
+                continue
+                
+            deadline = time.monotonic() + self.max_wait
+            try:
+                while len(batch) < INFERENCE_BATCH:
+                    batch.extend(self._take(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+                
+            if not batch:
+                continue
+                
+            try:
+                predictions = self.model.predict(np.stack([x for x, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+                
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(prediction)
+    
+    def _take(self, timeout):
+        """
+        Dequeue one request and mark its future running.
+        
+        Args:
+            timeout: Seconds to wait for a request
+            
+        Returns:
+            List holding the request, or empty if the caller cancelled it
+            
+        Raises:
+            queue.Empty: If no request arrived within timeout
+        """
+        x, future = self._requests.get(timeout=timeout)
+        if not future.set_running_or_notify_cancel():
+            return []
+        return [(x, future)]
@@ -3,37 +3,72 @@ Database Configuration for Smart Traffic Light Controller System
 Handles connection settings for PostgreSQL, InfluxDB, and Redis
 """
 import os
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Union
+
+@dataclass(frozen=True)
+class PostgresConfig:
+    """PostgreSQL connection settings"""
+    __slots__ = ("host", "port", "database", "user", "password",
+                 "min_connections", "max_connections")
+    host: str
+    port: int
+    database: str
+    user: str
+    password: str
+    min_connections: int
+    max_connections: int
+
+@dataclass(frozen=True)
+class InfluxDBConfig:
+    """InfluxDB connection settings"""
+    __slots__ = ("url", "token", "org", "bucket", "retention_period")
+    url: str
+    token: str
+    org: str
+    bucket: str
+    retention_period: str
+
+@dataclass(frozen=True)
+class RedisConfig:
+    """Redis connection settings"""
+    __slots__ = ("host", "port", "db", "password", "decode_responses", "socket_timeout")
+    host: str
+    port: int
+    db: int
+    password: Optional[str]
+    decode_responses: bool
+    socket_timeout: int
 
 # PostgreSQL Configuration
-POSTGRES_CONFIG = {
-    "host": os.environ.get("POSTGRES_HOST", "localhost"),
-    "port": int(os.environ.get("POSTGRES_PORT", 5432)),
-    "database": os.environ.get("POSTGRES_DB", "traffic_control"),
-    "user": os.environ.get("POSTGRES_USER", "postgres"),
-    "password": os.environ.get("POSTGRES_PASSWORD", "postgres"),
-    "min_connections": int(os.environ.get("POSTGRES_MIN_CONN", 5)),
-    "max_connections": int(os.environ.get("POSTGRES_MAX_CONN", 20)),
-}
+POSTGRES_CONFIG = PostgresConfig(
+    host=os.environ.get("POSTGRES_HOST", "localhost"),
+    port=int(os.environ.get("POSTGRES_PORT", 5432)),
+    database=os.environ.get("POSTGRES_DB", "traffic_control"),
+    user=os.environ.get("POSTGRES_USER", "postgres"),
+    password=os.environ.get("POSTGRES_PASSWORD", "postgres"),
+    min_connections=int(os.environ.get("POSTGRES_MIN_CONN", 5)),
+    max_connections=int(os.environ.get("POSTGRES_MAX_CONN", 20)),
+)
 
 # InfluxDB Configuration for time-series data
-INFLUXDB_CONFIG = {
-    "url": os.environ.get("INFLUXDB_URL", "http://localhost:8086"),
-    "token": os.environ.get("INFLUXDB_TOKEN", "traffic_token"),
-    "org": os.environ.get("INFLUXDB_ORG", "traffic_org"),
-    "bucket": os.environ.get("INFLUXDB_BUCKET", "traffic_metrics"),
-    "retention_period": os.environ.get("INFLUXDB_RETENTION", "30d"),
-}
+INFLUXDB_CONFIG = InfluxDBConfig(
+    url=os.environ.get("INFLUXDB_URL", "http://localhost:8086"),
+    token=os.environ.get("INFLUXDB_TOKEN", "traffic_token"),
+    org=os.environ.get("INFLUXDB_ORG", "traffic_org"),
+    bucket=os.environ.get("INFLUXDB_BUCKET", "traffic_metrics"),
+    retention_period=os.environ.get("INFLUXDB_RETENTION", "30d"),
+)
 
 # Redis Configuration for caching and pub/sub
-REDIS_CONFIG = {
-    "host": os.environ.get("REDIS_HOST", "localhost"),
-    "port": int(os.environ.get("REDIS_PORT", 6379)),
-    "db": int(os.environ.get("REDIS_DB", 0)),
-    "password": os.environ.get("REDIS_PASSWORD", None),
-    "decode_responses": True,
-    "socket_timeout": 5,
-}
+REDIS_CONFIG = RedisConfig(
+    host=os.environ.get("REDIS_HOST", "localhost"),
+    port=int(os.environ.get("REDIS_PORT", 6379)),
+    db=int(os.environ.get("REDIS_DB", 0)),
+    password=os.environ.get("REDIS_PASSWORD", None),
+    decode_responses=True,
+    socket_timeout=5,
+)
 
 # Database selection for different data types
 DATA_STORAGE_MAPPING = {
@@ -51,7 +86,13 @@ DATA_STORAGE_MAPPING = {
     "emergency_vehicles": "redis",      # Active emergency vehicle data
 }
 
-def get_db_config(db_type: str) -> Dict[str, Any]:
+_DB_CONFIGS = {
+    "postgres": POSTGRES_CONFIG,
+    "influxdb": INFLUXDB_CONFIG,
+    "redis": REDIS_CONFIG,
+}
+
+def get_db_config(db_type: str) -> Union[PostgresConfig, InfluxDBConfig, RedisConfig]:
     """
     Get configuration for specified database type
     
@@ -59,13 +100,9 @@ def get_db_config(db_type: str) -> Dict[str, Any]:
         db_type: One of 'postgres', 'influxdb', or 'redis'
         
     Returns:
-        Dict containing configuration parameters
+        Frozen configuration object for the database
     """
-    if db_type.lower() == 'postgres':
-        return POSTGRES_CONFIG
-    elif db_type.lower() == 'influxdb':
-        return INFLUXDB_CONFIG
-    elif db_type.lower() == 'redis':
-        return REDIS_CONFIG
-    else:
+    try:
+        return _DB_CONFIGS[db_type.lower()]
+    except KeyError:
         raise ValueError(f"Unknown database type: {db_type}")
\ No newline at end of file
@@ -0,0 +1,260 @@
+"""
+Async PostgreSQL Connector for Smart Traffic Light Controller System
+Mirrors PostgresConnector on top of SQLAlchemy's asyncio engine and asyncpg
+"""
+import logging
+from typing import Dict, List, Any, Optional, Type, Union
+from contextlib import asynccontextmanager
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from database.config.database_config import get_db_config
+from database.models.postgres_models import Base
+
+logger = logging.getLogger(__name__)
+
+class AsyncPostgresConnector:
+    """
+    Connector for non-blocking PostgreSQL operations from async handlers
+    
+    Offers the same CRUD methods as PostgresConnector. The COPY paths are
+    left out: bulk_insert_mappings always issues a multi-row INSERT, and
+    there is no bulk_copy or execute_raw_query_arrow.
+    """
+    
+    def __init__(self):
+        """Initialize async PostgreSQL connection"""
+        self.config = get_db_config("postgres")
+        self.connection_string = (
+            f"postgresql+asyncpg://{self.config.user}:{self.config.password}@"
+            f"{self.config.host}:{self.config.port}/{self.config.database}"
+        )
+        
+        self.engine = create_async_engine(
+            self.connection_string,
+            pool_size=self.config.min_connections,
+            max_overflow=self.config.max_connections - self.config.min_connections,
+            pool_timeout=30,
+            pool_recycle=1800,  # Recycle connections after 30 minutes
+        )
+        
+        self.SessionLocal = async_sessionmaker(
+            bind=self.engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    
+    async def create_tables(self):
+        """Create all tables defined in the models"""
+        try:
+            async with self.engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+            logger.info("Database tables created successfully")
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating database tables: {e}")
+            return False
+    
+    @asynccontextmanager
+    async def get_session(self):
+        """
+        Get an async database session with automatic closing
+        
+        Yields:
+            SQLAlchemy async session
+        """
+        session: AsyncSession = self.SessionLocal()
+        try:
+            yield session
+            await session.commit()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Database session error: {e}")
+            raise
+        finally:
+            await session.close()
+    
+    async def add_item(self, item: Base) -> bool:
+        """
+        Add a single item to the database
+        
+        Args:
+            item: SQLAlchemy model instance
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            async with self.get_session() as session:
+                session.add(item)
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error adding item to database: {e}")
+            return False
+    
+    async def add_items(self, items: List[Base]) -> bool:
+        """
+        Add multiple items to the database
+        
+        Args:
+            items: List of SQLAlchemy model instances
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            async with self.get_session() as session:
+                session.add_all(items)
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error adding items to database: {e}")
+            return False
+    
+    async def bulk_insert_mappings(self, model_class: Type[Base], rows: List[Dict[str, Any]]) -> bool:
+        """
+        Insert many rows using a single Core INSERT
+        
+        Args:
+            model_class: SQLAlchemy model class
+            rows: List of column-name to value dictionaries
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not rows:
+            return True
+        
+        try:
+            async with self.engine.begin() as connection:
+                await connection.execute(model_class.__table__.insert(), rows)
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk inserting items: {e}")
+            return False
+    
+    async def get_by_id(self, model_class: Type[Base], item_id: Union[str, int]) -> Optional[Base]:
+        """
+        Get an item by its ID
+        
+        Args:
+            model_class: SQLAlchemy model class
+            item_id: ID of the item
+        
+        Returns:
+            Model instance if found, None otherwise
+        """
+        try:
+            async with self.get_session() as session:
+                return await session.get(model_class, item_id)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting item by ID: {e}")
+            return None
+    
+    async def get_all(self, model_class: Type[Base],
+                      filters: Optional[Dict[str, Any]] = None,
+                      limit: Optional[int] = None,
+                      offset: Optional[int] = None) -> List[Base]:
+        """
+        Get all items of a model class with optional filtering
+        
+        Args:
+            model_class: SQLAlchemy model class
+            filters: Optional dictionary of filter conditions
+            limit: Optional limit on number of results
+            offset: Optional offset for pagination
+        
+        Returns:
+            List of model instances
+        """
+        try:
+            async with self.get_session() as session:
+                stmt = select(model_class)
+                
+                if filters:
+                    for key, value in filters.items():
+                        if hasattr(model_class, key):
+                            stmt = stmt.where(getattr(model_class, key) == value)
+                
+                if limit is not None:
+                    stmt = stmt.limit(limit)
+                
+                if offset is not None:
+                    stmt = stmt.offset(offset)
+                
+                result = await session.execute(stmt)
+                return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting items: {e}")
+            return []
+    
+    async def update_item(self, model_class: Type[Base], item_id: Union[str, int],
+                          update_data: Dict[str, Any]) -> bool:
+        """
+        Update an item by its ID
+        
+        Args:
+            model_class: SQLAlchemy model class
+            item_id: ID of the item
+            update_data: Dictionary of fields to update
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        columns = model_class.__table__.columns
+        values = {key: value for key, value in update_data.items() if key in columns}
+        
+        try:
+            async with self.get_session() as session:
+                if not values:
+                    return await session.get(model_class, item_id) is not None
+                
+                stmt = update(model_class).where(model_class.id == item_id).values(values)
+                result = await session.execute(stmt)
+                return result.rowcount > 0
+        except SQLAlchemyError as e:
+            logger.error(f"Error updating item: {e}")
+            return False
+    
+    async def delete_item(self, model_class: Type[Base], item_id: Union[str, int]) -> bool:
+        """
+        Delete an item by its ID
+        
+        Args:
+            model_class: SQLAlchemy model class
+            item_id: ID of the item
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(delete(model_class).where(model_class.id == item_id))
+                return result.rowcount > 0
+        except SQLAlchemyError as e:
+            logger.error(f"Error deleting item: {e}")
+            return False
+    
+    async def execute_raw_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a raw SQL query
+        
+        Args:
+            query: SQL query string
+            params: Optional parameters for the query
+        
+        Returns:
+            List of result rows as dictionaries
+        """
+        try:
+            async with self.engine.connect() as connection:
+                result = await connection.execute(text(query), params or {})
+                return [dict(row) for row in result.mappings()]
+        except SQLAlchemyError as e:
+            logger.error(f"Error executing raw query: {e}")
+            return []
+    
+    async def close(self):
+        """Close database connection"""
+        await self.engine.dispose()
@@ -3,20 +3,37 @@ InfluxDB Connector for Smart Traffic Light Controller System
 Handles time-series data storage and retrieval
 """
 import logging
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Union, Any
 from datetime import datetime, timedelta
 
 from influxdb_client import InfluxDBClient, Point, WritePrecision
 from influxdb_client.client.write_api import SYNCHRONOUS, ASYNCHRONOUS
 from influxdb_client.client.exceptions import InfluxDBError
 
-from database.config.database_config import INFLUXDB_CONFIG
+from database.config.database_config import get_db_config
 
 logger = logging.getLogger(__name__)
 
 class InfluxDBConnector:
     """Connector for InfluxDB time-series database operations"""
     
+    # Flux query templates, formatted per call with validated arguments
+    _TRAFFIC_METRICS_QUERY = (
+        'from(bucket: "{bucket}")'
+        ' |> range(start: {start}, stop: {stop})'
+        ' |> filter(fn: (r) => r._measurement == "traffic_metrics")'
+        ' |> filter(fn: (r) => r.intersection_id == "{intersection_id}")'
+        ' |> {aggregation}()'
+    )
+    _SENSOR_READINGS_QUERY = (
+        'from(bucket: "{bucket}")'
+        ' |> range(start: {start}, stop: {stop})'
+        ' |> filter(fn: (r) => r._measurement == "sensor_readings")'
+        ' |> filter(fn: (r) => r.sensor_id == "{sensor_id}")'
+        ' |> limit(n: {limit})'
+    )
+    AGGREGATIONS = frozenset({"mean", "max", "min", "sum", "count"})
+    
     def __init__(self, async_mode: bool = False):
         """
         Initialize InfluxDB client
@@ -24,17 +41,17 @@ class InfluxDBConnector:
         Args:
             async_mode: If True, use asynchronous write mode
         """
-        self.config = INFLUXDB_CONFIG
+        self.config = get_db_config("influxdb")
         self.client = InfluxDBClient(
-            url=self.config["url"],
-            token=self.config["token"],
-            org=self.config["org"]
+            url=self.config.url,
+            token=self.config.token,
+            org=self.config.org
         )
         self.write_api = self.client.write_api(
             write_options=ASYNCHRONOUS if async_mode else SYNCHRONOUS
         )
         self.query_api = self.client.query_api()
-        self.bucket = self.config["bucket"]
+        self.bucket = self.config.bucket
         
     def write_data_point(self, measurement: str, tags: Dict[str, str], 
                         fields: Dict[str, Union[float, int, str, bool]], 
@@ -52,20 +69,7 @@ class InfluxDBConnector:
             True if successful, False otherwise
         """
         try:
-            point = Point(measurement)
-            
-            # Add tags
-            for tag_key, tag_value in tags.items():
-                point = point.tag(tag_key, tag_value)
-                
-            # Add fields
-            for field_key, field_value in fields.items():
-                point = point.field(field_key, field_value)
-                
-            # Set timestamp if provided
-            if timestamp:
-                point = point.time(timestamp, WritePrecision.NS)
-                
+            point = self._build_point(measurement, tags, fields, timestamp)
             self.write_api.write(bucket=self.bucket, record=point)
             return True
         except InfluxDBError as e:
@@ -89,6 +93,73 @@ class InfluxDBConnector:
             logger.error(f"Error batch writing to InfluxDB: {e}")
             return False
     
+    def write_points_batch(self, points: List[Tuple[str, Dict[str, str],
+                                                    Dict[str, Union[float, int, str, bool]],
+                                                    Optional[datetime]]]) -> bool:
+        """
+        Write many data points in a single request
+        
+        Args:
+            points: List of (measurement, tags, fields, timestamp) tuples
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.write_batch([
+            self._build_point(measurement, tags, fields, timestamp)
+            for measurement, tags, fields, timestamp in points
+        ])
+    
+    @staticmethod
+    def _build_point(measurement: str, tags: Dict[str, str],
+                     fields: Dict[str, Union[float, int, str, bool]],
+                     timestamp: Optional[datetime] = None) -> Point:
+        """Build a Point from a measurement, tags, fields and optional timestamp"""
+        point = Point(measurement)
+        
+        # Add tags
+        for tag_key, tag_value in tags.items():
+            point = point.tag(tag_key, tag_value)
+            
+        # Add fields
+        for field_key, field_value in fields.items():
+            point = point.field(field_key, field_value)
+            
+        # Set timestamp if provided
+        if timestamp:
+            point = point.time(timestamp, WritePrecision.NS)
+            
+        return point
+    
+    def query_data_iter(self, query: str) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a Flux query and stream the result records
+        
+        Records are yielded as they are parsed from the response instead of
+        materializing every table first, keeping memory flat for large pulls.
+        
+        Args:
+            query: Flux query string
+            
+        Yields:
+            Result records as dictionaries
+            
+        Raises:
+            InfluxDBError: If the query fails, including after some records
+                were already yielded, so a cut-off stream is never mistaken
+                for a complete result
+        """
+        try:
+            for record in self.query_api.query_stream(query, org=self.config.org):
+                yield {
+                    "time": record.get_time(),
+                    "measurement": record.get_measurement(),
+                    **record.values
+                }
+        except InfluxDBError as e:
+            logger.error(f"Error querying InfluxDB: {e}")
+            raise
+    
     def query_data(self, query: str) -> List[Dict[str, Any]]:
         """
         Execute a Flux query against InfluxDB
@@ -97,22 +168,11 @@ class InfluxDBConnector:
             query: Flux query string
             
         Returns:
-            List of result records
+            List of result records, empty on error
         """
         try:
-            tables = self.query_api.query(query, org=self.config["org"])
-            
-            results = []
-            for table in tables:
-                for record in table.records:
-                    results.append({
-                        "time": record.get_time(),
-                        "measurement": record.get_measurement(),
-                        **record.values
-                    })
-            return results
-        except InfluxDBError as e:
-            logger.error(f"Error querying InfluxDB: {e}")
+            return list(self.query_data_iter(query))
+        except InfluxDBError:
             return []
     
     def get_traffic_metrics(self, intersection_id: str, start_time: datetime, 
@@ -125,21 +185,27 @@ class InfluxDBConnector:
             intersection_id: ID of the intersection
             start_time: Start time for the query
             end_time: End time for the query (defaults to current time)
-            aggregation: Aggregation function (mean, max, min, sum)
+            aggregation: Aggregation function (mean, max, min, sum, count)
             
         Returns:
             List of traffic metrics
+            
+        Raises:
+            ValueError: If aggregation is not a supported function
         """
+        if aggregation not in self.AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation: {aggregation}")
+            
         if not end_time:
             end_time = datetime.utcnow()
             
-        query = f'''
-        from(bucket: "{self.bucket}")
-            |> range(start: {int(start_time.timestamp())}, stop: {int(end_time.timestamp())})
-            |> filter(fn: (r) => r._measurement == "traffic_metrics")
-            |> filter(fn: (r) => r.intersection_id == "{intersection_id}")
-            |> {aggregation}()
-        '''
+        query = self._TRAFFIC_METRICS_QUERY.format(
+            bucket=self.bucket,
+            start=int(start_time.timestamp()),
+            stop=int(end_time.timestamp()),
+            intersection_id=intersection_id,
+            aggregation=aggregation
+        )
         
         return self.query_data(query)
     
@@ -161,13 +227,13 @@ class InfluxDBConnector:
         if not end_time:
             end_time = datetime.utcnow()
             
-        query = f'''
-        from(bucket: "{self.bucket}")
-            |> range(start: {int(start_time.timestamp())}, stop: {int(end_time.timestamp())})
-            |> filter(fn: (r) => r._measurement == "sensor_readings")
-            |> filter(fn: (r) => r.sensor_id == "{sensor_id}")
-            |> limit(n: {limit})
-        '''
+        query = self._SENSOR_READINGS_QUERY.format(
+            bucket=self.bucket,
+            start=int(start_time.timestamp()),
+            stop=int(end_time.timestamp()),
+            sensor_id=sensor_id,
+            limit=int(limit)
+        )
         
         return self.query_data(query)
     
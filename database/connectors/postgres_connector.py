@@ -2,35 +2,62 @@
 PostgreSQL Connector for Smart Traffic Light Controller System
 Handles relational data storage and retrieval using SQLAlchemy
 """
+import io
+import json
 import logging
-from typing import Dict, List, Any, Optional, Type, Union
+from typing import Callable, Dict, List, Any, Optional, Type, Union
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, delete, text, update
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from sqlalchemy.exc import SQLAlchemyError
 
-from database.config.database_config import POSTGRES_CONFIG
+from database.config.database_config import get_db_config
 from database.models.postgres_models import Base
 
 logger = logging.getLogger(__name__)
 
+# Row count above which bulk_insert_mappings switches from a multi-row INSERT to COPY
+COPY_THRESHOLD = 10000
+
+# NULL marker for COPY; every non-NULL field is quoted, so a literal \N stays text
+COPY_NULL = "\\N"
+
+def _python_default(column) -> Optional[Callable[[], Any]]:
+    """Zero-argument callable producing a column's Python-side default, or None"""
+    default = column.default
+    if default is None:
+        return None
+    if default.is_scalar:
+        return lambda: default.arg
+    if default.is_callable:
+        return lambda: default.arg(None)
+    return None
+
+def _copy_field(value: Any) -> str:
+    """Render one value as a COPY csv field"""
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
 class PostgresConnector:
     """Connector for PostgreSQL database operations"""
     
     def __init__(self):
         """Initialize PostgreSQL connection"""
-        self.config = POSTGRES_CONFIG
+        self.config = get_db_config("postgres")
         self.connection_string = (
-            f"postgresql://{self.config['user']}:{self.config['password']}@"
-            f"{self.config['host']}:{self.config['port']}/{self.config['database']}"
+            f"postgresql://{self.config.user}:{self.config.password}@"
+            f"{self.config.host}:{self.config.port}/{self.config.database}"
         )
         
         self.engine = create_engine(
             self.connection_string,
-            pool_size=self.config["min_connections"],
-            max_overflow=self.config["max_connections"] - self.config["min_connections"],
+            pool_size=self.config.min_connections,
+            max_overflow=self.config.max_connections - self.config.min_connections,
             pool_timeout=30,
             pool_recycle=1800,  # Recycle connections after 30 minutes
         )
@@ -106,6 +133,88 @@ class PostgresConnector:
             logger.error(f"Error adding items to database: {e}")
             return False
     
+    def bulk_insert_mappings(self, model_class: Type[Base], rows: List[Dict[str, Any]]) -> bool:
+        """
+        Insert many rows using a single Core INSERT, bypassing the ORM unit of work
+        
+        Args:
+            model_class: SQLAlchemy model class
+            rows: List of column-name to value dictionaries
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not rows:
+            return True
+        if len(rows) > COPY_THRESHOLD:
+            return self.bulk_copy(model_class, rows)
+            
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(model_class.__table__.insert(), rows)
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk inserting items: {e}")
+            return False
+    
+    def bulk_copy(self, model_class: Type[Base], rows: List[Dict[str, Any]]) -> bool:
+        """
+        Load many rows through PostgreSQL COPY FROM STDIN
+        
+        Rows may carry different keys. Columns missing from a row get their
+        Python-side default, or NULL when they have none; columns no row sets
+        and without a Python-side default are left to the server default.
+        
+        Args:
+            model_class: SQLAlchemy model class
+            rows: List of column-name to value dictionaries
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not rows:
+            return True
+            
+        table = model_class.__table__
+        keys = set().union(*rows)
+        defaults = {column.name: _python_default(column) for column in table.columns}
+        columns = [
+            column.name for column in table.columns
+            if column.name in keys or defaults[column.name] is not None
+        ]
+        
+        buffer = io.StringIO()
+        for row in rows:
+            fields = []
+            for column in columns:
+                if column in row:
+                    value = row[column]
+                elif defaults[column] is not None:
+                    value = defaults[column]()
+                else:
+                    value = None
+                fields.append(_copy_field(value))
+            buffer.write(",".join(fields) + "\n")
+        buffer.seek(0)
+        
+        copy_sql = (
+            f"COPY {table.name} ({', '.join(columns)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+        
+        raw_connection = self.engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            cursor.copy_expert(copy_sql, buffer)
+            raw_connection.commit()
+            return True
+        except Exception as e:
+            raw_connection.rollback()
+            logger.error(f"Error copying items into {table.name}: {e}")
+            return False
+        finally:
+            raw_connection.close()
+    
     def get_by_id(self, model_class: Type[Base], item_id: Union[str, int]) -> Optional[Base]:
         """
         Get an item by its ID
@@ -119,7 +228,7 @@ class PostgresConnector:
         """
         try:
             with self.get_session() as session:
-                return session.query(model_class).filter(model_class.id == item_id).first()
+                return session.get(model_class, item_id)
         except SQLAlchemyError as e:
             logger.error(f"Error getting item by ID: {e}")
             return None
@@ -173,17 +282,17 @@ class PostgresConnector:
         Returns:
             True if successful, False otherwise
         """
+        columns = model_class.__table__.columns
+        values = {key: value for key, value in update_data.items() if key in columns}
+        
         try:
             with self.get_session() as session:
-                item = session.query(model_class).filter(model_class.id == item_id).first()
-                if not item:
-                    return False
+                if not values:
+                    return session.get(model_class, item_id) is not None
                     
-                for key, value in update_data.items():
-                    if hasattr(item, key):
-                        setattr(item, key, value)
-                        
-                return True
+                stmt = update(model_class).where(model_class.id == item_id).values(values)
+                result = session.execute(stmt)
+                return result.rowcount > 0
         except SQLAlchemyError as e:
             logger.error(f"Error updating item: {e}")
             return False
@@ -201,12 +310,8 @@ class PostgresConnector:
         """
         try:
             with self.get_session() as session:
-                item = session.query(model_class).filter(model_class.id == item_id).first()
-                if not item:
-                    return False
-                    
-                session.delete(item)
-                return True
+                result = session.execute(delete(model_class).where(model_class.id == item_id))
+                return result.rowcount > 0
         except SQLAlchemyError as e:
             logger.error(f"Error deleting item: {e}")
             return False
@@ -230,6 +335,43 @@ class PostgresConnector:
             logger.error(f"Error executing raw query: {e}")
             return []
     
+    def execute_raw_query_arrow(self, query: str, params: Optional[Dict[str, Any]] = None):
+        """
+        Execute a raw SQL query and return the result in columnar form
+        
+        Rows are transposed into one Arrow array per column instead of one
+        dict per row, so wide result sets can be handed to vectorized code
+        without repacking.
+        
+        Args:
+            query: SQL query string
+            params: Optional parameters for the query
+            
+        Returns:
+            pyarrow.RecordBatch with one column per result field, or None on error
+        """
+        # Imported lazily so pyarrow is only required by callers of this method
+        import pyarrow as pa
+        
+        try:
+            with self.engine.connect() as connection:
+                result = connection.execute(text(query), params or {})
+                names = list(result.keys())
+                rows = result.fetchall()
+        except SQLAlchemyError as e:
+            logger.error(f"Error executing raw query: {e}")
+            return None
+            
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+        try:
+            return pa.RecordBatch.from_arrays(
+                [pa.array(column) for column in columns],
+                names=names
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.error(f"Error converting query result to Arrow: {e}")
+            return None
+    
     def close(self):
         """Close database connection"""
         self.engine.dispose()
\ No newline at end of file
@@ -2,31 +2,49 @@
 Redis Connector for Smart Traffic Light Controller System
 Handles caching, pub/sub, and real-time data operations
 """
+import copy
 import json
 import logging
+import threading
 from typing import Dict, List, Any, Optional, Union, Callable
 import redis
+from cachetools import TTLCache
 
-from database.config.database_config import REDIS_CONFIG
+from database.config.database_config import get_db_config
 
 logger = logging.getLogger(__name__)
 
+# In-process cache for hot intersection status reads
+STATUS_CACHE_SIZE = 4096
+STATUS_CACHE_TTL = 1.0  # seconds
+
+def _is_status_key(key: str) -> bool:
+    """Whether a key holds an intersection status mirrored in the local cache"""
+    return key.startswith("intersection:") and key.endswith(":status")
+
 class RedisConnector:
     """Connector for Redis operations including caching and pub/sub"""
     
     def __init__(self):
         """Initialize Redis connection"""
-        self.config = REDIS_CONFIG
+        self.config = get_db_config("redis")
         self.redis = redis.Redis(
-            host=self.config["host"],
-            port=self.config["port"],
-            db=self.config["db"],
-            password=self.config["password"],
-            decode_responses=self.config["decode_responses"],
-            socket_timeout=self.config["socket_timeout"]
+            host=self.config.host,
+            port=self.config.port,
+            db=self.config.db,
+            password=self.config.password,
+            decode_responses=self.config.decode_responses,
+            socket_timeout=self.config.socket_timeout
         )
         self.pubsub = self.redis.pubsub()
         
+        # Short-lived local copy of intersection status, keyed by Redis key. The
+        # generation is bumped on every invalidation, so a read that raced with
+        # a write does not cache the value it fetched before that write.
+        self._status_cache = TTLCache(maxsize=STATUS_CACHE_SIZE, ttl=STATUS_CACHE_TTL)
+        self._status_cache_lock = threading.Lock()
+        self._status_generation = 0
+        
     def set_value(self, key: str, value: Union[str, Dict, List], 
                  expiry: Optional[int] = None) -> bool:
         """
@@ -45,13 +63,16 @@ class RedisConnector:
                 value = json.dumps(value)
                 
             if expiry:
-                return bool(self.redis.setex(key, expiry, value))
+                result = bool(self.redis.setex(key, expiry, value))
             else:
-                return bool(self.redis.set(key, value))
+                result = bool(self.redis.set(key, value))
         except redis.RedisError as e:
             logger.error(f"Error setting Redis value: {e}")
             return False
             
+        self._invalidate_cached_status(key)
+        return result
+            
     def get_value(self, key: str, deserialize: bool = True) -> Any:
         """
         Get a value from Redis
@@ -76,6 +97,72 @@ class RedisConnector:
             logger.error(f"Error getting Redis value: {e}")
             return None
             
+    def set_and_fetch(self, key: str, value: Union[str, Dict, List],
+                      expiry: Optional[int] = None) -> Any:
+        """
+        Set a value and read it back in a single round trip
+        
+        Args:
+            key: Redis key
+            value: Value to store (will be JSON serialized if dict or list)
+            expiry: Optional expiration time in seconds
+            
+        Returns:
+            Stored value as read back from Redis, None on error
+        """
+        try:
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value)
+                
+            with self.redis.pipeline() as pipe:
+                pipe.set(key, value, ex=expiry)
+                pipe.get(key)
+                _, stored = pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Error setting and fetching Redis value: {e}")
+            return None
+            
+        self._invalidate_cached_status(key)
+        try:
+            return json.loads(stored)
+        except (json.JSONDecodeError, TypeError):
+            return stored
+            
+    def set_values(self, values: Dict[str, Union[str, Dict, List]],
+                   expiry: Optional[int] = None) -> bool:
+        """
+        Set many values in a single round trip
+        
+        Args:
+            values: Mapping of Redis key to value (dicts and lists are JSON serialized)
+            expiry: Optional expiration time in seconds applied to every key
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not values:
+            return True
+            
+        try:
+            mapping = {
+                key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                for key, value in values.items()
+            }
+            
+            with self.redis.pipeline() as pipe:
+                pipe.mset(mapping)
+                if expiry:
+                    for key in mapping:
+                        pipe.expire(key, expiry)
+                result = bool(pipe.execute()[0])
+        except redis.RedisError as e:
+            logger.error(f"Error setting Redis values: {e}")
+            return False
+            
+        for key in values:
+            self._invalidate_cached_status(key)
+        return result
+            
     def delete_key(self, key: str) -> bool:
         """
         Delete a key from Redis
@@ -87,11 +174,14 @@ class RedisConnector:
             True if successful, False otherwise
         """
         try:
-            return bool(self.redis.delete(key))
+            result = bool(self.redis.delete(key))
         except redis.RedisError as e:
             logger.error(f"Error deleting Redis key: {e}")
             return False
             
+        self._invalidate_cached_status(key)
+        return result
+            
     def publish_message(self, channel: str, message: Union[str, Dict, List]) -> bool:
         """
         Publish a message to a Redis channel
@@ -157,10 +247,24 @@ class RedisConnector:
             intersection_id: ID of the intersection
             
         Returns:
-            Dictionary with intersection status
+            Dictionary with intersection status; a copy, so callers may modify it
         """
         key = f"intersection:{intersection_id}:status"
-        return self.get_value(key, deserialize=True) or {}
+        with self._status_cache_lock:
+            status = self._status_cache.get(key)
+            generation = self._status_generation
+        if status is not None:
+            return copy.deepcopy(status)
+            
+        status = self.get_value(key, deserialize=True)
+        if not status:
+            return {}
+            
+        # Skip caching if the status was written or deleted while it was fetched
+        with self._status_cache_lock:
+            if generation == self._status_generation:
+                self._status_cache[key] = status
+        return copy.deepcopy(status)
         
     def set_intersection_status(self, intersection_id: str, 
                               status: Dict[str, Any], 
@@ -179,6 +283,33 @@ class RedisConnector:
         key = f"intersection:{intersection_id}:status"
         return self.set_value(key, status, expiry)
         
+    def set_intersection_statuses(self, statuses: Dict[str, Dict[str, Any]],
+                                  expiry: int = 300) -> bool:
+        """
+        Set current status for many intersections at once, e.g. when filling
+        the cache from PostgreSQL
+        
+        Args:
+            statuses: Mapping of intersection ID to status dictionary
+            expiry: Expiration time in seconds
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.set_values(
+            {f"intersection:{intersection_id}:status": status
+             for intersection_id, status in statuses.items()},
+            expiry
+        )
+        
+    def _invalidate_cached_status(self, key: str) -> None:
+        """Drop a key from the local status cache after it is written or deleted"""
+        if not _is_status_key(key):
+            return
+        with self._status_cache_lock:
+            self._status_cache.pop(key, None)
+            self._status_generation += 1
+            
     def close(self) -> None:
         """Close Redis connection"""
         try:
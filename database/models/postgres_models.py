@@ -1,15 +1,33 @@
 """
 PostgreSQL data models for Smart Traffic Light Controller System
 Uses SQLAlchemy ORM for database interactions
+
+Models are mapped dataclasses: columns without a default come first in the
+generated __init__, and the primary key is kept first in the table with
+sort_order. Server-generated timestamps and relationships are left out of
+__init__. UUID keys also carry an insert_default, since default_factory only
+applies to __init__ and Core inserts would otherwise leave them NULL.
+
+One-to-many relationships raise instead of lazy loading, so collections
+must be loaded explicitly in the query that needs them, e.g.
+
+    session.query(Intersection).options(
+        selectinload(Intersection.signals),
+        selectinload(Intersection.sensors)
+    )
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Enum
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-import enum
 from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Integer, String, Float, Boolean, DateTime, ForeignKey, CheckConstraint, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import DeclarativeBase, Mapped, MappedAsDataclass, mapped_column, relationship
+from sqlalchemy.sql import func
+import enum
 import uuid
 
-Base = declarative_base()
+class Base(MappedAsDataclass, DeclarativeBase, eq=False):
+    """Declarative base; instances compare and hash by identity like plain ORM objects"""
+    pass
 
 class SignalStatus(enum.Enum):
     GREEN = "green"
@@ -24,110 +42,132 @@ class IntersectionType(enum.Enum):
     ROUNDABOUT = "roundabout"
     COMPLEX = "complex"
 
+def _values_check(table: str, column: str, enum_class) -> CheckConstraint:
+    """CHECK constraint restricting a string column to the values of an enum"""
+    values = ", ".join(f"'{member.value}'" for member in enum_class)
+    return CheckConstraint(f"{column} IN ({values})", name=f"ck_{table}_{column}")
+
 class Intersection(Base):
     """Intersection configuration and metadata"""
     __tablename__ = "intersections"
+    __table_args__ = (
+        _values_check("intersections", "type", IntersectionType),
+        Index("ix_intersections_active", "is_active", postgresql_where=text("is_active")),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String(100), nullable=False)
-    location_lat = Column(Float, nullable=False)
-    location_lon = Column(Float, nullable=False)
-    type = Column(Enum(IntersectionType), nullable=False)
-    lanes_count = Column(Integer, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    is_active = Column(Boolean, default=True)
-    config = Column(JSON)  # Stores complex configuration as JSON
+    name: Mapped[str] = mapped_column(String(100))
+    location_lat: Mapped[float] = mapped_column(Float)
+    location_lon: Mapped[float] = mapped_column(Float)
+    type: Mapped[str] = mapped_column(String(16))  # IntersectionType value
+    lanes_count: Mapped[int] = mapped_column(Integer)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default_factory=uuid.uuid4, insert_default=uuid.uuid4, sort_order=-1)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), init=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), init=False)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    config: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, default=None)  # Stores complex configuration as JSON
     
     # Relationships
-    signals = relationship("Signal", back_populates="intersection")
-    sensors = relationship("Sensor", back_populates="intersection")
+    signals: Mapped[List["Signal"]] = relationship(back_populates="intersection", lazy="raise_on_sql", init=False, repr=False)
+    sensors: Mapped[List["Sensor"]] = relationship(back_populates="intersection", lazy="raise_on_sql", init=False, repr=False)
 
 class Signal(Base):
     """Traffic signal configuration"""
     __tablename__ = "signals"
+    __table_args__ = (
+        _values_check("signals", "current_status", SignalStatus),
+        Index("ix_signals_intersection_status", "intersection_id", "current_status"),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    intersection_id = Column(String(36), ForeignKey("intersections.id"), nullable=False)
-    position = Column(String(50), nullable=False)  # e.g., "north_bound", "east_left"
-    default_timing = Column(Integer, nullable=False)  # Default timing in seconds
-    min_timing = Column(Integer, nullable=False)
-    max_timing = Column(Integer, nullable=False)
-    current_status = Column(Enum(SignalStatus), default=SignalStatus.RED)
-    last_status_change = Column(DateTime, default=datetime.utcnow)
+    intersection_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("intersections.id"))
+    position: Mapped[str] = mapped_column(String(50))  # e.g., "north_bound", "east_left"
+    default_timing: Mapped[int] = mapped_column(Integer)  # Default timing in seconds
+    min_timing: Mapped[int] = mapped_column(Integer)
+    max_timing: Mapped[int] = mapped_column(Integer)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default_factory=uuid.uuid4, insert_default=uuid.uuid4, sort_order=-1)
+    current_status: Mapped[Optional[str]] = mapped_column(String(16), default=SignalStatus.RED.value)  # SignalStatus value
+    last_status_change: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), init=False)
     
     # Relationships
-    intersection = relationship("Intersection", back_populates="signals")
-    timing_plans = relationship("TimingPlan", back_populates="signal")
+    intersection: Mapped["Intersection"] = relationship(back_populates="signals", init=False, repr=False)
+    timing_plans: Mapped[List["TimingPlan"]] = relationship(back_populates="signal", lazy="raise_on_sql", init=False, repr=False)
 
 class Sensor(Base):
     """Traffic sensors at intersections"""
     __tablename__ = "sensors"
+    __table_args__ = (
+        Index("ix_sensors_intersection_status", "intersection_id", "status"),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    intersection_id = Column(String(36), ForeignKey("intersections.id"), nullable=False)
-    type = Column(String(50), nullable=False)  # e.g., "camera", "induction_loop"
-    position = Column(String(50), nullable=False)
-    status = Column(String(20), default="active")
-    last_maintenance = Column(DateTime, default=datetime.utcnow)
-    firmware_version = Column(String(50))
+    intersection_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("intersections.id"))
+    type: Mapped[str] = mapped_column(String(50))  # e.g., "camera", "induction_loop"
+    position: Mapped[str] = mapped_column(String(50))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default_factory=uuid.uuid4, insert_default=uuid.uuid4, sort_order=-1)
+    status: Mapped[Optional[str]] = mapped_column(String(20), default="active")
+    last_maintenance: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), init=False)
+    firmware_version: Mapped[Optional[str]] = mapped_column(String(50), default=None)
     
     # Relationships
-    intersection = relationship("Intersection", back_populates="sensors")
+    intersection: Mapped["Intersection"] = relationship(back_populates="sensors", init=False, repr=False)
 
 class TimingPlan(Base):
     """Signal timing plans for different scenarios"""
     __tablename__ = "timing_plans"
+    __table_args__ = (
+        Index("ix_timing_plans_signal_active_priority", "signal_id", "is_active", "priority"),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    signal_id = Column(String(36), ForeignKey("signals.id"), nullable=False)
-    name = Column(String(100), nullable=False)
-    description = Column(String(255))
-    time_of_day_start = Column(Integer)  # Minutes from midnight
-    time_of_day_end = Column(Integer)    # Minutes from midnight
-    weekday_mask = Column(Integer)       # Bitmask for days of week
-    green_time = Column(Integer, nullable=False)
-    yellow_time = Column(Integer, nullable=False)
-    red_time = Column(Integer, nullable=False)
-    is_active = Column(Boolean, default=True)
-    priority = Column(Integer, default=0)
+    signal_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("signals.id"))
+    name: Mapped[str] = mapped_column(String(100))
+    green_time: Mapped[int] = mapped_column(Integer)
+    yellow_time: Mapped[int] = mapped_column(Integer)
+    red_time: Mapped[int] = mapped_column(Integer)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default_factory=uuid.uuid4, insert_default=uuid.uuid4, sort_order=-1)
+    description: Mapped[Optional[str]] = mapped_column(String(255), default=None)
+    time_of_day_start: Mapped[Optional[int]] = mapped_column(Integer, default=None)  # Minutes from midnight
+    time_of_day_end: Mapped[Optional[int]] = mapped_column(Integer, default=None)    # Minutes from midnight
+    weekday_mask: Mapped[Optional[int]] = mapped_column(Integer, default=None)       # Bitmask for days of week
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    priority: Mapped[Optional[int]] = mapped_column(Integer, default=0)
     
     # Relationships
-    signal = relationship("Signal", back_populates="timing_plans")
+    signal: Mapped["Signal"] = relationship(back_populates="timing_plans", init=False, repr=False)
 
 class User(Base):
     """System users"""
     __tablename__ = "users"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    username = Column(String(50), unique=True, nullable=False)
-    email = Column(String(100), unique=True, nullable=False)
-    password_hash = Column(String(255), nullable=False)
-    role = Column(String(20), nullable=False)
-    is_active = Column(Boolean, default=True)
-    last_login = Column(DateTime)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    username: Mapped[str] = mapped_column(String(50), unique=True)
+    email: Mapped[str] = mapped_column(String(100), unique=True)
+    password_hash: Mapped[str] = mapped_column(String(255))
+    role: Mapped[str] = mapped_column(String(20))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default_factory=uuid.uuid4, insert_default=uuid.uuid4, sort_order=-1)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    last_login: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), default=None)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), init=False)
 
 class SystemSettings(Base):
     """Global system settings"""
     __tablename__ = "system_settings"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    key = Column(String(100), unique=True, nullable=False)
-    value = Column(String(255), nullable=False)
-    description = Column(String(255))
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    updated_by = Column(String(36), ForeignKey("users.id"))
+    key: Mapped[str] = mapped_column(String(100), unique=True)
+    value: Mapped[str] = mapped_column(String(255))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False, sort_order=-1)
+    description: Mapped[Optional[str]] = mapped_column(String(255), default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), init=False)
+    updated_by: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), default=None)
 
 class OptimizationRun(Base):
     """Records of optimization algorithm runs"""
     __tablename__ = "optimization_runs"
+    __table_args__ = (
+        Index("ix_optruns_results_gin", "results", postgresql_using="gin"),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    algorithm = Column(String(50), nullable=False)
-    start_time = Column(DateTime, nullable=False)
-    end_time = Column(DateTime)
-    status = Column(String(20), default="running")
-    parameters = Column(JSON)
-    results = Column(JSON)
-    created_by = Column(String(36), ForeignKey("users.id"))
\ No newline at end of file
+    algorithm: Mapped[str] = mapped_column(String(50))
+    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default_factory=uuid.uuid4, insert_default=uuid.uuid4, sort_order=-1)
+    end_time: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), default=None)
+    status: Mapped[Optional[str]] = mapped_column(String(20), default="running")
+    parameters: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, default=None)
+    results: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, default=None)
+    created_by: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), default=None)
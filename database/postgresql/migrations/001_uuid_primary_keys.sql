@@ -0,0 +1,36 @@
+-- Convert text UUID primary and foreign keys to the native uuid type.
+-- Foreign keys are dropped while the referenced columns change type and
+-- recreated afterwards.
+
+BEGIN;
+
+ALTER TABLE signals DROP CONSTRAINT IF EXISTS signals_intersection_id_fkey;
+ALTER TABLE sensors DROP CONSTRAINT IF EXISTS sensors_intersection_id_fkey;
+ALTER TABLE timing_plans DROP CONSTRAINT IF EXISTS timing_plans_signal_id_fkey;
+ALTER TABLE system_settings DROP CONSTRAINT IF EXISTS system_settings_updated_by_fkey;
+ALTER TABLE optimization_runs DROP CONSTRAINT IF EXISTS optimization_runs_created_by_fkey;
+
+ALTER TABLE intersections ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE signals ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE signals ALTER COLUMN intersection_id TYPE uuid USING intersection_id::uuid;
+ALTER TABLE sensors ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE sensors ALTER COLUMN intersection_id TYPE uuid USING intersection_id::uuid;
+ALTER TABLE timing_plans ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE timing_plans ALTER COLUMN signal_id TYPE uuid USING signal_id::uuid;
+ALTER TABLE users ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE system_settings ALTER COLUMN updated_by TYPE uuid USING updated_by::uuid;
+ALTER TABLE optimization_runs ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE optimization_runs ALTER COLUMN created_by TYPE uuid USING created_by::uuid;
+
+ALTER TABLE signals ADD CONSTRAINT signals_intersection_id_fkey
+    FOREIGN KEY (intersection_id) REFERENCES intersections (id);
+ALTER TABLE sensors ADD CONSTRAINT sensors_intersection_id_fkey
+    FOREIGN KEY (intersection_id) REFERENCES intersections (id);
+ALTER TABLE timing_plans ADD CONSTRAINT timing_plans_signal_id_fkey
+    FOREIGN KEY (signal_id) REFERENCES signals (id);
+ALTER TABLE system_settings ADD CONSTRAINT system_settings_updated_by_fkey
+    FOREIGN KEY (updated_by) REFERENCES users (id);
+ALTER TABLE optimization_runs ADD CONSTRAINT optimization_runs_created_by_fkey
+    FOREIGN KEY (created_by) REFERENCES users (id);
+
+COMMIT;
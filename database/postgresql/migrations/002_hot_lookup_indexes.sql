@@ -0,0 +1,11 @@
+-- Composite indexes for the common signal, sensor and timing plan lookups,
+-- plus a partial index over active intersections.
+
+CREATE INDEX IF NOT EXISTS ix_signals_intersection_status
+    ON signals (intersection_id, current_status);
+CREATE INDEX IF NOT EXISTS ix_sensors_intersection_status
+    ON sensors (intersection_id, status);
+CREATE INDEX IF NOT EXISTS ix_timing_plans_signal_active_priority
+    ON timing_plans (signal_id, is_active, priority);
+CREATE INDEX IF NOT EXISTS ix_intersections_active
+    ON intersections (is_active) WHERE is_active;
@@ -0,0 +1,13 @@
+-- Store JSON payloads as binary JSONB and index optimization results for
+-- containment (@>) queries.
+
+BEGIN;
+
+ALTER TABLE intersections ALTER COLUMN config TYPE jsonb USING config::jsonb;
+ALTER TABLE optimization_runs ALTER COLUMN parameters TYPE jsonb USING parameters::jsonb;
+ALTER TABLE optimization_runs ALTER COLUMN results TYPE jsonb USING results::jsonb;
+
+CREATE INDEX IF NOT EXISTS ix_optruns_results_gin
+    ON optimization_runs USING gin (results);
+
+COMMIT;
@@ -0,0 +1,28 @@
+-- Move timestamp defaults into the database and store them with time zone.
+-- Existing naive values are interpreted as UTC.
+
+BEGIN;
+
+ALTER TABLE intersections
+    ALTER COLUMN created_at TYPE timestamptz USING created_at AT TIME ZONE 'UTC',
+    ALTER COLUMN created_at SET DEFAULT now(),
+    ALTER COLUMN updated_at TYPE timestamptz USING updated_at AT TIME ZONE 'UTC',
+    ALTER COLUMN updated_at SET DEFAULT now();
+
+ALTER TABLE signals
+    ALTER COLUMN last_status_change TYPE timestamptz USING last_status_change AT TIME ZONE 'UTC',
+    ALTER COLUMN last_status_change SET DEFAULT now();
+
+ALTER TABLE sensors
+    ALTER COLUMN last_maintenance TYPE timestamptz USING last_maintenance AT TIME ZONE 'UTC',
+    ALTER COLUMN last_maintenance SET DEFAULT now();
+
+ALTER TABLE users
+    ALTER COLUMN created_at TYPE timestamptz USING created_at AT TIME ZONE 'UTC',
+    ALTER COLUMN created_at SET DEFAULT now();
+
+ALTER TABLE system_settings
+    ALTER COLUMN updated_at TYPE timestamptz USING updated_at AT TIME ZONE 'UTC',
+    ALTER COLUMN updated_at SET DEFAULT now();
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- Store intersection type and signal status as CHECK-constrained strings.
+-- The native enum columns held member names ('FOUR_WAY', 'GREEN'); the
+-- models now use the lowercase enum values.
+
+BEGIN;
+
+ALTER TABLE intersections
+    ALTER COLUMN type TYPE varchar(16) USING lower(type::text);
+ALTER TABLE intersections ADD CONSTRAINT ck_intersections_type
+    CHECK (type IN ('four_way', 'three_way', 'roundabout', 'complex'));
+
+ALTER TABLE signals
+    ALTER COLUMN current_status TYPE varchar(16) USING lower(current_status::text);
+ALTER TABLE signals ADD CONSTRAINT ck_signals_current_status
+    CHECK (current_status IN ('green', 'yellow', 'red', 'flashing', 'off'));
+
+DROP TYPE IF EXISTS intersectiontype;
+DROP TYPE IF EXISTS signalstatus;
+
+COMMIT;
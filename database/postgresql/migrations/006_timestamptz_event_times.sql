@@ -0,0 +1,13 @@
+-- Store the remaining event timestamps with time zone, like the server-side
+-- timestamps converted in 004. Existing naive values are interpreted as UTC.
+
+BEGIN;
+
+ALTER TABLE users
+    ALTER COLUMN last_login TYPE timestamptz USING last_login AT TIME ZONE 'UTC';
+
+ALTER TABLE optimization_runs
+    ALTER COLUMN start_time TYPE timestamptz USING start_time AT TIME ZONE 'UTC',
+    ALTER COLUMN end_time TYPE timestamptz USING end_time AT TIME ZONE 'UTC';
+
+COMMIT;
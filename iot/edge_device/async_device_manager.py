@@ -0,0 +1,382 @@
+import json
+import time
+import asyncio
+import logging
+import requests
+from typing import Dict, List, Any, Optional
+import aiomqtt
+
+# Payload encoding, logging setup and the HTTP session are shared with the
+# thread-based manager
+from iot.edge_device.device_manager import _SESSION, _dumps, _loads, _payload_templates
+
+logger = logging.getLogger("AsyncEdgeDeviceManager")
+
+# Interval between retained online status refreshes
+HEARTBEAT_INTERVAL = 60
+
+# Reconnect backoff after the broker connection drops, doubling up to the maximum
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+class AsyncEdgeDeviceManager:
+    """
+    Asyncio counterpart of EdgeDeviceManager built on aiomqtt.
+    Periodic work runs as tasks on the event loop, so many devices can share
+    one thread instead of each holding its own timer threads.
+    """
+    
+    def __init__(
+        self,
+        device_id: str,
+        mqtt_broker: str = "localhost",
+        mqtt_port: int = 1883,
+        api_endpoint: str = "http://localhost:8000",
+        update_interval: int = 5
+    ):
+        self.device_id = device_id
+        self.mqtt_broker = mqtt_broker
+        self.mqtt_port = mqtt_port
+        self.api_endpoint = api_endpoint
+        self.update_interval = update_interval
+        
+        # Device status
+        self.status = "initializing"
+        self.connected = False
+        self.started_at = time.time()
+        
+        # Sensor data cache of (value, timestamp) tuples; only touched from the
+        # event loop, so no lock is needed
+        self.sensor_data = {}
+        self._sequence = 0
+        
+        # Clock read once per publish window and shared by the readings in it
+        self._now_cached = time.time()
+        
+        # Topics
+        self.command_topic = f"traffic/devices/{device_id}/commands"
+        self.status_topic = f"traffic/devices/{device_id}/status"
+        self.data_topic = f"traffic/devices/{device_id}/data"
+        
+        # Pre-rendered payload prefixes
+        self._status_template, self._data_prefix_template = _payload_templates(device_id)
+        
+        # MQTT client, created per start since an aiomqtt client is single use
+        self.mqtt_client: Optional[aiomqtt.Client] = None
+        self._tasks: List[asyncio.Task] = []
+        # Held so the event loop's weak reference is not the only one
+        self._restart_task: Optional[asyncio.Task] = None
+        self.running = False
+    
+    async def start(self):
+        """Start the device manager and connect to MQTT broker"""
+        try:
+            logger.info("Starting edge device manager for device %s", self.device_id)
+            self.running = True
+            self.started_at = time.time()
+            
+            await self._connect()
+            
+            # Periodic work and command handling run as tasks on the event loop
+            self._tasks = [
+                asyncio.create_task(self._heartbeat_loop()),
+                asyncio.create_task(self._data_transmission_loop()),
+                asyncio.create_task(self._message_loop()),
+            ]
+            
+            # Register device with central system
+            await self._register_device()
+            
+            self.status = "running"
+            logger.info("Edge device %s started successfully", self.device_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to start edge device manager: %s", e)
+            
+            # Undo whatever part of the start succeeded
+            self.running = False
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            await self._disconnect()
+            
+            self.status = "error"
+            return False
+    
+    async def stop(self):
+        """Stop the device manager and disconnect from MQTT broker"""
+        logger.info("Stopping edge device %s", self.device_id)
+        self.running = False
+        self.status = "stopping"
+        
+        # Publish offline status
+        await self._publish_status("offline")
+        
+        # Cancel periodic tasks, leaving the caller's own task alone
+        current = asyncio.current_task()
+        tasks = [task for task in self._tasks if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        
+        # Disconnect from MQTT broker
+        await self._disconnect()
+        
+        self.status = "stopped"
+        logger.info("Edge device %s stopped", self.device_id)
+    
+    def update_sensor_data(self, sensor_type: str, data: Any, precise: bool = False):
+        """
+        Update sensor data in the local cache
+        
+        Readings are stamped with the clock cached for the current publish
+        window unless precise is set, in which case the clock is read now.
+        """
+        self.sensor_data[sensor_type] = (data, time.time() if precise else self._now_cached)
+    
+    async def _register_device(self):
+        """Register this device with the central system"""
+        try:
+            device_info = {
+                "device_id": self.device_id,
+                "device_type": "traffic_controller",
+                "capabilities": ["camera", "traffic_light_control", "vehicle_detection"],
+                "location": {
+                    "latitude": 0.0,  # To be updated with actual GPS coordinates
+                    "longitude": 0.0
+                }
+            }
+            
+            # Try to register via API; requests blocks, so it runs off the event loop
+            try:
+                response = await asyncio.to_thread(
+                    _SESSION.post,
+                    f"{self.api_endpoint}/api/devices/register",
+                    json=device_info,
+                    timeout=5
+                )
+                if response.status_code == 200:
+                    logger.info("Device %s registered successfully via API", self.device_id)
+                    return
+            except requests.RequestException as e:
+                logger.warning("API registration failed, falling back to MQTT: %s", e)
+            
+            # Fall back to MQTT registration
+            await self.mqtt_client.publish(
+                "traffic/devices/registration",
+                _dumps(device_info),
+                qos=1
+            )
+            logger.info("Device %s registration sent via MQTT", self.device_id)
+        
+        except Exception as e:
+            logger.error("Failed to register device: %s", e)
+    
+    async def _connect(self):
+        """Open a new MQTT connection and subscribe to the command topic"""
+        # The broker publishes a retained offline status if the connection drops
+        client = aiomqtt.Client(
+            hostname=self.mqtt_broker,
+            port=self.mqtt_port,
+            identifier=f"edge-device-{self.device_id}",
+            keepalive=60,
+            will=aiomqtt.Will(
+                self.status_topic,
+                _dumps({"device_id": self.device_id, "status": "offline"}),
+                qos=1,
+                retain=True
+            )
+        )
+        await client.__aenter__()
+        self.mqtt_client = client
+        self.connected = True
+        logger.info("Connected to MQTT broker at %s:%s", self.mqtt_broker, self.mqtt_port)
+        
+        await client.subscribe(self.command_topic, qos=1)
+        logger.info("Subscribed to %s", self.command_topic)
+    
+    async def _disconnect(self):
+        """Close the current MQTT connection, if any"""
+        client, self.mqtt_client = self.mqtt_client, None
+        self.connected = False
+        if client is None:
+            return
+        try:
+            await client.__aexit__(None, None, None)
+        except aiomqtt.MqttError as e:
+            logger.warning("Error disconnecting from MQTT broker: %s", e)
+    
+    async def _reconnect(self):
+        """Reconnect with exponential backoff until connected or stopped"""
+        delay = RECONNECT_MIN_DELAY
+        while self.running:
+            await self._disconnect()
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+            except aiomqtt.MqttError as e:
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                logger.warning("Reconnect to MQTT broker failed, retrying in %ss: %s", delay, e)
+                continue
+            
+            # The will may have replaced the retained status while disconnected
+            await self._publish_status("online")
+            return
+    
+    async def _message_loop(self):
+        """Dispatch messages received on subscribed topics, reconnecting on drops"""
+        while self.running:
+            try:
+                async for msg in self.mqtt_client.messages:
+                    try:
+                        payload = _loads(msg.payload)
+                        logger.info("Received message on %s: %s", msg.topic, payload)
+                        
+                        if msg.topic.matches(self.command_topic):
+                            await self._handle_command(payload)
+                    except json.JSONDecodeError:
+                        logger.error("Invalid JSON in message: %s", msg.payload)
+                    except Exception as e:
+                        logger.error("Error processing message: %s", e)
+            except aiomqtt.MqttError as e:
+                logger.warning("Disconnected from MQTT broker: %s", e)
+                self.connected = False
+                await self._reconnect()
+    
+    async def _handle_command(self, command: Dict):
+        """Handle command received from central system"""
+        if "action" not in command:
+            logger.warning("Received command without action field")
+            return
+        
+        action = command["action"]
+        logger.info("Handling command: %s", action)
+        
+        if action == "restart":
+            # Restart in a separate task, since stop cancels the message loop
+            self._restart_task = asyncio.create_task(self._restart())
+        
+        elif action == "update_config":
+            if "config" in command:
+                logger.info("Updating configuration: %s", command['config'])
+                # Apply new configuration
+                # ...
+        
+        elif action == "set_traffic_light":
+            if "state" in command:
+                logger.info("Setting traffic light state to: %s", command['state'])
+                # Update traffic light state
+                # ...
+        
+        else:
+            logger.warning("Unknown command action: %s", action)
+    
+    async def _restart(self):
+        """Simulate device restart"""
+        await self.stop()
+        await asyncio.sleep(2)
+        await self.start()
+    
+    async def _publish_status(self, status: str):
+        """Publish device status to MQTT"""
+        if not self.connected:
+            logger.warning("Cannot publish status: not connected to MQTT broker")
+            return
+        
+        now = time.time()
+        uptime = now - self.started_at if status == "online" else 0.0
+        payload = self._status_template % (status.encode(), now, uptime)
+        
+        try:
+            await self.mqtt_client.publish(self.status_topic, payload, qos=1, retain=True)
+        except aiomqtt.MqttError as e:
+            logger.error("Failed to publish status: %s", e)
+            return
+        logger.debug("Published status: %s", status)
+    
+    async def _publish_sensor_data(self):
+        """Publish sensor readings accumulated since the last publish to MQTT"""
+        if not self.connected or not self.sensor_data:
+            return
+        
+        # Swap out the cache so each batch is published once
+        readings, self.sensor_data = self.sensor_data, {}
+        self._sequence += 1
+        
+        payload = (
+            self._data_prefix_template % (self._sequence, self._now_cached) +
+            _dumps(readings) + b"}"
+        )
+        
+        try:
+            await self.mqtt_client.publish(self.data_topic, payload, qos=0)
+        except aiomqtt.MqttError as e:
+            logger.error("Failed to publish sensor data: %s", e)
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Published sensor data: %d readings", len(readings))
+    
+    async def _heartbeat_loop(self):
+        """Periodically refresh the retained online status"""
+        while self.running:
+            await self._publish_status("online")
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+    
+    async def _data_transmission_loop(self):
+        """Periodic task for sending sensor data"""
+        while self.running:
+            await asyncio.sleep(self.update_interval)
+            self._now_cached = time.time()
+            if self.running and self.connected:
+                await self._publish_sensor_data()
+
+
+async def run_devices(devices: List[AsyncEdgeDeviceManager]) -> List[bool]:
+    """Start many devices concurrently on the running event loop"""
+    return await asyncio.gather(*(device.start() for device in devices))
+
+
+if __name__ == "__main__":
+    import numpy as np
+    
+    # uvloop is optional; the default event loop works the same, only slower
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    async def main():
+        # Example usage
+        device_manager = AsyncEdgeDeviceManager(
+            device_id="intersection-001",
+            mqtt_broker="localhost",
+            mqtt_port=1883,
+            api_endpoint="http://localhost:8000"
+        )
+        await run_devices([device_manager])
+        
+        # Pre-generate random traffic data in batches instead of one draw per reading
+        simulation_batch = 10000
+        rng = np.random.default_rng()
+        vehicle_counts = rng.integers(0, 30, size=simulation_batch, endpoint=True)
+        queue_lengths = rng.integers(0, 15, size=simulation_batch, endpoint=True)
+        i = 0
+        
+        try:
+            # Simulate sensor data updates
+            while True:
+                # Update with random traffic data
+                device_manager.update_sensor_data("vehicle_count", int(vehicle_counts[i % simulation_batch]))
+                device_manager.update_sensor_data("queue_length", int(queue_lengths[i % simulation_batch]))
+                i += 1
+                await asyncio.sleep(5)
+        finally:
+            await device_manager.stop()
+    
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,18 +1,252 @@
+import os
 import json
+import socket
 import time
+import heapq
+import itertools
 import logging
 import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 
-# Configure logging
+# Prefer orjson for MQTT payloads; both encoders produce bytes
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+# Configure logging; records skip the thread and process lookups
+logging.logThreads = False
+logging.logProcesses = False
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger("EdgeDeviceManager")
 
+# Shared HTTP session so API calls reuse keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# How long the broker keeps a disconnected client's session and subscriptions
+SESSION_EXPIRY_INTERVAL = 3600  # seconds
+
+def _payload_templates(device_id: str):
+    """
+    Pre-render a device's status and data payload prefixes
+    
+    Only the per-tick fields are formatted in: the status template takes
+    (status, timestamp, uptime), the data prefix (sequence, timestamp).
+    """
+    device_id_json = _dumps(device_id).replace(b"%", b"%%")
+    status_template = (
+        b'{"device_id":' + device_id_json +
+        b',"status":"%s","timestamp":%f,"uptime":%f}'
+    )
+    data_prefix_template = (
+        b'{"device_id":' + device_id_json +
+        b',"seq":%d,"timestamp":%f,"sensors":'
+    )
+    return status_template, data_prefix_template
+
+class MqttConnectionPool:
+    """
+    Small pool of MQTT connections shared by many edge devices.
+    Devices publish over a round-robin client, and periodic device work runs on
+    a single scheduler thread feeding a shared ThreadPoolExecutor.
+    """
+    
+    def __init__(
+        self,
+        mqtt_broker: str = "localhost",
+        mqtt_port: int = 1883,
+        size: Optional[int] = None,
+        client_id_prefix: Optional[str] = None,
+        keepalive: int = 60
+    ):
+        # Client ids must be unique on the broker, or pools in different processes
+        # would take over each other's persistent sessions
+        if client_id_prefix is None:
+            client_id_prefix = f"edge-pool-{socket.gethostname()}-{os.getpid()}"
+        
+        self.mqtt_broker = mqtt_broker
+        self.mqtt_port = mqtt_port
+        self.keepalive = keepalive
+        self.size = size or os.cpu_count() or 1
+        
+        self.clients = []
+        self._devices = {}
+        self._connack_properties = {}
+        self._next_topic_alias = {}
+        self._lock = threading.Lock()
+        
+        for i in range(self.size):
+            client = mqtt.Client(client_id=f"{client_id_prefix}-{i}", protocol=mqtt.MQTTv5)
+            client.on_connect = self._on_connect
+            client.on_disconnect = self._on_disconnect
+            client.on_socket_open = self._on_socket_open
+            self.clients.append(client)
+            self._devices[client] = []
+            self._next_topic_alias[client] = 1
+        self._round_robin = itertools.cycle(self.clients)
+        
+        # Periodic tasks: heap of (due, sequence, interval, fn, cancelled)
+        self.executor = None
+        self._tasks = []
+        self._task_sequence = itertools.count()
+        self._tasks_changed = threading.Condition()
+        self._scheduler_thread = None
+        self.running = False
+    
+    def start(self):
+        """Connect every client and start the shared scheduler"""
+        self.running = True
+        self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="edge-device")
+        
+        # Resume persistent sessions so subscriptions survive reconnects
+        connect_properties = Properties(PacketTypes.CONNECT)
+        connect_properties.SessionExpiryInterval = SESSION_EXPIRY_INTERVAL
+        
+        for client in self.clients:
+            client.connect(
+                self.mqtt_broker,
+                self.mqtt_port,
+                self.keepalive,
+                clean_start=False,
+                properties=connect_properties
+            )
+            client.loop_start()
+        
+        self._scheduler_thread = threading.Thread(target=self._scheduler_loop)
+        self._scheduler_thread.daemon = True
+        self._scheduler_thread.start()
+    
+    def stop(self):
+        """Stop the scheduler and disconnect every client"""
+        self.running = False
+        with self._tasks_changed:
+            self._tasks_changed.notify_all()
+        if self._scheduler_thread:
+            self._scheduler_thread.join(timeout=2.0)
+        if self.executor:
+            self.executor.shutdown(wait=False)
+        
+        for client in self.clients:
+            client.loop_stop()
+            client.disconnect()
+    
+    def acquire_round_robin(self) -> mqtt.Client:
+        """Return the next client in round-robin order"""
+        with self._lock:
+            return next(self._round_robin)
+    
+    def allocate_topic_alias(self, client: mqtt.Client) -> int:
+        """Reserve a topic alias number that is unique on the given client"""
+        with self._lock:
+            alias = self._next_topic_alias[client]
+            self._next_topic_alias[client] += 1
+            return alias
+    
+    def add_device(self, client: mqtt.Client, device: "EdgeDeviceManager"):
+        """Route connection callbacks of a client to a device"""
+        # Registering the device and checking for a CONNACK under one lock means
+        # either this call or _on_connect delivers the connect, never both
+        with self._lock:
+            self._devices[client].append(device)
+            connected = client in self._connack_properties
+            properties = self._connack_properties.get(client)
+        
+        # Devices joining an already connected client still need their connect handling
+        if connected:
+            device._on_connect(client, None, {}, 0, properties)
+    
+    def remove_device(self, client: mqtt.Client, device: "EdgeDeviceManager"):
+        """Stop routing connection callbacks of a client to a device"""
+        with self._lock:
+            if device in self._devices[client]:
+                self._devices[client].remove(device)
+    
+    def schedule_every(self, interval: float, fn) -> threading.Event:
+        """
+        Run fn on the shared executor every interval seconds.
+        
+        Returns:
+            Event that cancels the task when set
+        """
+        cancelled = threading.Event()
+        with self._tasks_changed:
+            heapq.heappush(
+                self._tasks,
+                (time.monotonic() + interval, next(self._task_sequence), interval, fn, cancelled)
+            )
+            self._tasks_changed.notify()
+        return cancelled
+    
+    def _scheduler_loop(self):
+        """Background thread that dispatches due periodic tasks to the executor"""
+        while self.running:
+            with self._tasks_changed:
+                if not self._tasks:
+                    self._tasks_changed.wait()
+                    continue
+                
+                due, _, interval, fn, cancelled = self._tasks[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._tasks_changed.wait(delay)
+                    continue
+                
+                heapq.heappop(self._tasks)
+                if cancelled.is_set():
+                    continue
+                heapq.heappush(
+                    self._tasks,
+                    (due + interval, next(self._task_sequence), interval, fn, cancelled)
+                )
+            
+            self.executor.submit(fn)
+    
+    def _on_socket_open(self, client, userdata, sock):
+        """Disable Nagle's algorithm so small QoS 1 packets are not held back"""
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            logger.warning("Failed to set TCP_NODELAY on MQTT socket: %s", e)
+    
+    def _on_connect(self, client, userdata, flags, rc, properties=None):
+        """Fan a client's connect callback out to its devices"""
+        with self._lock:
+            if rc == 0:
+                self._connack_properties[client] = properties
+            devices = list(self._devices[client])
+        for device in devices:
+            device._on_connect(client, userdata, flags, rc, properties)
+    
+    def _on_disconnect(self, client, userdata, rc, properties=None):
+        """Fan a client's disconnect callback out to its devices"""
+        with self._lock:
+            self._connack_properties.pop(client, None)
+            devices = list(self._devices[client])
+        for device in devices:
+            device._on_disconnect(client, userdata, rc, properties)
+
+
 class EdgeDeviceManager:
     """
     Manages communication between edge devices (cameras, sensors) and the central system.
@@ -25,7 +259,8 @@ class EdgeDeviceManager:
         mqtt_broker: str = "localhost",
         mqtt_port: int = 1883,
         api_endpoint: str = "http://localhost:8000",
-        update_interval: int = 5
+        update_interval: int = 5,
+        pool: Optional[MqttConnectionPool] = None
     ):
         self.device_id = device_id
         self.mqtt_broker = mqtt_broker
@@ -33,88 +268,133 @@ class EdgeDeviceManager:
         self.api_endpoint = api_endpoint
         self.update_interval = update_interval
         
-        # Device status
+        # Device status; connected is only flipped under the lock so a connect
+        # delivered twice is handled once
         self.status = "initializing"
         self.connected = False
-        self.last_heartbeat = time.time()
+        self._connected_lock = threading.Lock()
+        self.started_at = time.time()
         
-        # Sensor data cache
+        # Sensor data cache of (value, timestamp) tuples, swapped out under the
+        # lock on each publish
         self.sensor_data = {}
+        self._sensor_lock = threading.Lock()
+        self._sequence = 0
         
-        # MQTT client setup
-        self.mqtt_client = mqtt.Client(client_id=f"edge-device-{device_id}")
-        self.mqtt_client.on_connect = self._on_connect
-        self.mqtt_client.on_disconnect = self._on_disconnect
-        self.mqtt_client.on_message = self._on_message
+        # Clock read once per publish window and shared by the readings in it
+        self._now_cached = time.time()
+        
+        # MQTT connection, shared through a pool; standalone devices get a private one
+        self._owns_pool = pool is None
+        if self._owns_pool:
+            pool = MqttConnectionPool(
+                mqtt_broker,
+                mqtt_port,
+                size=1,
+                client_id_prefix=f"edge-device-{device_id}"
+            )
+        self.pool = pool
+        self.mqtt_client = pool.acquire_round_robin()
         
         # Topics
         self.command_topic = f"traffic/devices/{device_id}/commands"
         self.status_topic = f"traffic/devices/{device_id}/status"
         self.data_topic = f"traffic/devices/{device_id}/data"
         
-        # Background threads
-        self.heartbeat_thread = None
-        self.data_thread = None
+        # Topic alias state for the data topic, renegotiated on every connect.
+        # The lock keeps a reconnect from resetting it mid-publish.
+        self._data_topic_alias = pool.allocate_topic_alias(self.mqtt_client)
+        self._data_alias_properties = Properties(PacketTypes.PUBLISH)
+        self._data_alias_properties.TopicAlias = self._data_topic_alias
+        self._data_alias_enabled = False
+        self._data_alias_sent = False
+        self._data_alias_lock = threading.Lock()
+        
+        # Session state, so reconnects skip work the broker already remembers
+        self._subscribed = False
+        self._last_published_status = None
+        
+        # Pre-rendered payload prefixes
+        self._status_template, self._data_prefix_template = _payload_templates(device_id)
+        
+        # Periodic tasks scheduled on the pool
+        self.data_task = None
         self.running = False
     
     def start(self):
         """Start the device manager and connect to MQTT broker"""
         try:
-            logger.info(f"Starting edge device manager for device {self.device_id}")
+            logger.info("Starting edge device manager for device %s", self.device_id)
             self.running = True
+            self.started_at = time.time()
             
-            # Connect to MQTT broker
-            self.mqtt_client.connect(self.mqtt_broker, self.mqtt_port, 60)
-            self.mqtt_client.loop_start()
-            
-            # Start background threads
-            self.heartbeat_thread = threading.Thread(target=self._heartbeat_loop)
-            self.heartbeat_thread.daemon = True
-            self.heartbeat_thread.start()
+            # Connect to MQTT broker; liveness comes from the MQTT keepalive, with the
+            # broker publishing a retained offline status if the connection drops.
+            # A will is per connection, so only a device with its own pool can set one.
+            if self._owns_pool:
+                self.mqtt_client.will_set(
+                    self.status_topic,
+                    _dumps({"device_id": self.device_id, "status": "offline"}),
+                    qos=1,
+                    retain=True
+                )
+                self.pool.start()
+            self.mqtt_client.message_callback_add(self.command_topic, self._on_message)
+            self.pool.add_device(self.mqtt_client, self)
             
-            self.data_thread = threading.Thread(target=self._data_transmission_loop)
-            self.data_thread.daemon = True
-            self.data_thread.start()
+            # Schedule periodic work on the shared executor
+            self.data_task = self.pool.schedule_every(self.update_interval, self._transmit_sensor_data)
             
             # Register device with central system
             self._register_device()
             
             self.status = "running"
-            logger.info(f"Edge device {self.device_id} started successfully")
+            logger.info("Edge device %s started successfully", self.device_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to start edge device manager: {str(e)}")
+            logger.error("Failed to start edge device manager: %s", e)
             self.status = "error"
             return False
     
     def stop(self):
         """Stop the device manager and disconnect from MQTT broker"""
-        logger.info(f"Stopping edge device {self.device_id}")
+        logger.info("Stopping edge device %s", self.device_id)
         self.running = False
         self.status = "stopping"
         
         # Publish offline status
         self._publish_status("offline")
         
-        # Stop MQTT client
-        self.mqtt_client.loop_stop()
-        self.mqtt_client.disconnect()
+        # Cancel periodic tasks
+        if self.data_task:
+            self.data_task.set()
         
-        # Wait for threads to finish
-        if self.heartbeat_thread:
-            self.heartbeat_thread.join(timeout=2.0)
-        if self.data_thread:
-            self.data_thread.join(timeout=2.0)
+        # Detach from the shared MQTT client. A pooled connection stays up, so its
+        # command subscription is dropped here; a device's own connection keeps
+        # the subscription in its persistent session for the next start.
+        self.mqtt_client.message_callback_remove(self.command_topic)
+        self.pool.remove_device(self.mqtt_client, self)
+        if not self._owns_pool and self._subscribed:
+            self.mqtt_client.unsubscribe(self.command_topic)
+            self._subscribed = False
+        with self._connected_lock:
+            self.connected = False
+        if self._owns_pool:
+            self.pool.stop()
         
         self.status = "stopped"
-        logger.info(f"Edge device {self.device_id} stopped")
+        logger.info("Edge device %s stopped", self.device_id)
     
-    def update_sensor_data(self, sensor_type: str, data: Any):
-        """Update sensor data in the local cache"""
-        self.sensor_data[sensor_type] = {
-            "value": data,
-            "timestamp": time.time()
-        }
+    def update_sensor_data(self, sensor_type: str, data: Any, precise: bool = False):
+        """
+        Update sensor data in the local cache
+        
+        Readings are stamped with the clock cached for the current publish
+        window unless precise is set, in which case the clock is read now.
+        """
+        reading = (data, time.time() if precise else self._now_cached)
+        with self._sensor_lock:
+            self.sensor_data[sensor_type] = reading
     
     def _register_device(self):
         """Register this device with the central system"""
@@ -131,61 +411,80 @@ class EdgeDeviceManager:
             
             # Try to register via API
             try:
-                response = requests.post(
+                response = _SESSION.post(
                     f"{self.api_endpoint}/api/devices/register",
                     json=device_info,
                     timeout=5
                 )
                 if response.status_code == 200:
-                    logger.info(f"Device {self.device_id} registered successfully via API")
+                    logger.info("Device %s registered successfully via API", self.device_id)
                     return
             except requests.RequestException as e:
-                logger.warning(f"API registration failed, falling back to MQTT: {str(e)}")
+                logger.warning("API registration failed, falling back to MQTT: %s", e)
             
             # Fall back to MQTT registration
             self.mqtt_client.publish(
                 "traffic/devices/registration",
-                json.dumps(device_info),
+                _dumps(device_info),
                 qos=1
             )
-            logger.info(f"Device {self.device_id} registration sent via MQTT")
+            logger.info("Device %s registration sent via MQTT", self.device_id)
             
         except Exception as e:
-            logger.error(f"Failed to register device: {str(e)}")
+            logger.error("Failed to register device: %s", e)
     
-    def _on_connect(self, client, userdata, flags, rc):
+    def _on_connect(self, client, userdata, flags, rc, properties=None):
         """Callback when connected to MQTT broker"""
         if rc == 0:
-            logger.info(f"Connected to MQTT broker at {self.mqtt_broker}:{self.mqtt_port}")
-            self.connected = True
+            with self._connected_lock:
+                if self.connected:
+                    return
+                self.connected = True
+            logger.info("Connected to MQTT broker at %s:%s", self.mqtt_broker, self.mqtt_port)
             
-            # Subscribe to command topic
-            client.subscribe(self.command_topic, qos=1)
-            logger.info(f"Subscribed to {self.command_topic}")
+            # Topic aliases are per connection and only usable if the broker allows them
+            alias_maximum = getattr(properties, "TopicAliasMaximum", 0) if properties else 0
+            with self._data_alias_lock:
+                self._data_alias_enabled = alias_maximum >= self._data_topic_alias
+                self._data_alias_sent = False
             
-            # Publish online status
+            # Subscribe to command topic unless the resumed session still holds it
+            if not (self._subscribed and flags.get("session present")):
+                client.subscribe(self.command_topic, qos=1)
+                self._subscribed = True
+                logger.info("Subscribed to %s", self.command_topic)
+            
+            # Publish online status if the retained one is stale
             self._publish_status("online")
         else:
-            logger.error(f"Failed to connect to MQTT broker, return code: {rc}")
-            self.connected = False
+            logger.error("Failed to connect to MQTT broker, return code: %s", rc)
+            with self._connected_lock:
+                self.connected = False
     
-    def _on_disconnect(self, client, userdata, rc):
+    def _on_disconnect(self, client, userdata, rc, properties=None):
         """Callback when disconnected from MQTT broker"""
-        logger.warning(f"Disconnected from MQTT broker with code: {rc}")
-        self.connected = False
+        logger.warning("Disconnected from MQTT broker with code: %s", rc)
+        with self._connected_lock:
+            self.connected = False
+        
+        # An unexpected drop makes the broker publish the will, replacing the retained status
+        if rc != 0 and self._owns_pool:
+            self._last_published_status = None
     
     def _on_message(self, client, userdata, msg):
         """Callback when message is received"""
         try:
-            payload = json.loads(msg.payload.decode())
-            logger.info(f"Received message on {msg.topic}: {payload}")
+            payload = _loads(msg.payload)
+            logger.info("Received message on %s: %s", msg.topic, payload)
             
+            # Commands run on the pool executor: this callback runs on the network
+            # thread of a client shared by many devices, and a restart blocks
             if msg.topic == self.command_topic:
-                self._handle_command(payload)
+                self.pool.executor.submit(self._handle_command, payload)
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in message: {msg.payload}")
+            logger.error("Invalid JSON in message: %s", msg.payload)
         except Exception as e:
-            logger.error(f"Error processing message: {str(e)}")
+            logger.error("Error processing message: %s", e)
     
     def _handle_command(self, command: Dict):
         """Handle command received from central system"""
@@ -194,7 +493,7 @@ class EdgeDeviceManager:
             return
         
         action = command["action"]
-        logger.info(f"Handling command: {action}")
+        logger.info("Handling command: %s", action)
         
         if action == "restart":
             # Simulate device restart
@@ -204,72 +503,86 @@ class EdgeDeviceManager:
         
         elif action == "update_config":
             if "config" in command:
-                logger.info(f"Updating configuration: {command['config']}")
+                logger.info("Updating configuration: %s", command['config'])
                 # Apply new configuration
                 # ...
         
         elif action == "set_traffic_light":
             if "state" in command:
-                logger.info(f"Setting traffic light state to: {command['state']}")
+                logger.info("Setting traffic light state to: %s", command['state'])
                 # Update traffic light state
                 # ...
         
         else:
-            logger.warning(f"Unknown command action: {action}")
+            logger.warning("Unknown command action: %s", action)
     
     def _publish_status(self, status: str):
         """Publish device status to MQTT"""
         if not self.connected:
             logger.warning("Cannot publish status: not connected to MQTT broker")
             return
+        if status == self._last_published_status:
+            return
         
-        status_data = {
-            "device_id": self.device_id,
-            "status": status,
-            "timestamp": time.time(),
-            "uptime": time.time() - self.last_heartbeat if status == "online" else 0
-        }
+        now = time.time()
+        uptime = now - self.started_at if status == "online" else 0.0
+        payload = self._status_template % (status.encode(), now, uptime)
         
-        self.mqtt_client.publish(
+        info = self.mqtt_client.publish(
             self.status_topic,
-            json.dumps(status_data),
+            payload,
             qos=1,
             retain=True
         )
-        logger.debug(f"Published status: {status}")
+        if info.rc == mqtt.MQTT_ERR_SUCCESS:
+            self._last_published_status = status
+        logger.debug("Published status: %s", status)
     
     def _publish_sensor_data(self):
-        """Publish sensor data to MQTT"""
-        if not self.connected or not self.sensor_data:
+        """Publish sensor readings accumulated since the last publish to MQTT"""
+        if not self.connected:
             return
         
-        data_payload = {
-            "device_id": self.device_id,
-            "timestamp": time.time(),
-            "sensors": self.sensor_data
-        }
+        # Snapshot and clear the cache so each batch is published once
+        with self._sensor_lock:
+            if not self.sensor_data:
+                return
+            readings, self.sensor_data = self.sensor_data, {}
+            self._sequence += 1
+            sequence = self._sequence
         
-        self.mqtt_client.publish(
-            self.data_topic,
-            json.dumps(data_payload),
-            qos=0
+        payload = (
+            self._data_prefix_template % (sequence, self._now_cached) +
+            _dumps(readings) + b"}"
         )
-        logger.debug(f"Published sensor data: {len(self.sensor_data)} readings")
-    
-    def _heartbeat_loop(self):
-        """Background thread for sending periodic heartbeats"""
-        while self.running:
-            if self.connected:
-                self._publish_status("online")
-                self.last_heartbeat = time.time()
-            time.sleep(60)  # Send heartbeat every minute
+        
+        # Once an aliased publish carrying the full topic has been queued, the
+        # broker maps the alias to the topic and later publishes send an empty
+        # topic name
+        with self._data_alias_lock:
+            topic = self.data_topic
+            properties = None
+            if self._data_alias_enabled:
+                properties = self._data_alias_properties
+                if self._data_alias_sent:
+                    topic = ""
+            
+            info = self.mqtt_client.publish(
+                topic,
+                payload,
+                qos=0,
+                properties=properties
+            )
+            if properties is not None and info.rc == mqtt.MQTT_ERR_SUCCESS:
+                self._data_alias_sent = True
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Published sensor data: %d readings", len(readings))
     
-    def _data_transmission_loop(self):
-        """Background thread for sending periodic sensor data"""
-        while self.running:
-            if self.connected:
-                self._publish_sensor_data()
-            time.sleep(self.update_interval)
+    def _transmit_sensor_data(self):
+        """Periodic task for sending sensor data"""
+        self._now_cached = time.time()
+        if self.running and self.connected:
+            self._publish_sensor_data()
 
 
 if __name__ == "__main__":
@@ -281,15 +594,23 @@ if __name__ == "__main__":
         api_endpoint="http://localhost:8000"
     )
     
+    # Pre-generate random traffic data in batches instead of one draw per reading
+    import numpy as np
+    SIMULATION_BATCH = 10000
+    rng = np.random.default_rng()
+    vehicle_counts = rng.integers(0, 30, size=SIMULATION_BATCH, endpoint=True)
+    queue_lengths = rng.integers(0, 15, size=SIMULATION_BATCH, endpoint=True)
+    i = 0
+    
     try:
         device_manager.start()
         
         # Simulate sensor data updates
         while True:
             # Update with random traffic data
-            import random
-            device_manager.update_sensor_data("vehicle_count", random.randint(0, 30))
-            device_manager.update_sensor_data("queue_length", random.randint(0, 15))
+            device_manager.update_sensor_data("vehicle_count", int(vehicle_counts[i % SIMULATION_BATCH]))
+            device_manager.update_sensor_data("queue_length", int(queue_lengths[i % SIMULATION_BATCH]))
+            i += 1
             time.sleep(5)
     
     except KeyboardInterrupt:
@@ -0,0 +1,8 @@
+"""
+Test configuration shared by unit and integration tests
+"""
+import os
+import sys
+
+# Add project root to path once for every test module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
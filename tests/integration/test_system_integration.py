@@ -3,15 +3,8 @@ Integration tests for the Smart Traffic Light Controller system
 Tests the interaction between different system components
 """
 import unittest
-import sys
-import os
-import requests
-import json
-from datetime import datetime, timedelta
-import time
-
-# Add project root to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+import uuid
+from datetime import datetime, timedelta, timezone
 
 from database.connectors.postgres_connector import PostgresConnector
 from database.connectors.influxdb_connector import InfluxDBConnector
@@ -28,7 +21,7 @@ class TestDatabaseIntegration(unittest.TestCase):
         self.redis = RedisConnector()
         
         # Create test data
-        self.test_intersection_id = f"test-intersection-{int(time.time())}"
+        self.test_intersection_id = uuid.uuid4()
         
     def tearDown(self):
         """Clean up after tests"""
@@ -39,21 +32,22 @@ class TestDatabaseIntegration(unittest.TestCase):
             session.commit()
         
         # Clean up Redis keys
-        self.redis.delete(f"intersection:{self.test_intersection_id}")
+        self.redis.delete_key(f"intersection:{self.test_intersection_id}")
         
     def test_postgres_to_redis_sync(self):
         """Test synchronization from PostgreSQL to Redis"""
         # Create intersection in PostgreSQL
         with self.postgres.get_session() as session:
-            from database.models.postgres_models import Intersection
+            from database.models.postgres_models import Intersection, IntersectionType
             
             intersection = Intersection(
                 id=self.test_intersection_id,
                 name="Test Integration Intersection",
-                location="Test Location",
-                intersection_type="four_way",
-                is_active=True,
-                created_at=datetime.utcnow()
+                location_lat=0.0,
+                location_lon=0.0,
+                type=IntersectionType.FOUR_WAY.value,
+                lanes_count=4,
+                is_active=True
             )
             
             session.add(intersection)
@@ -69,18 +63,16 @@ class TestDatabaseIntegration(unittest.TestCase):
         
         # Simulate caching in Redis (in a real system, this would be done by a service)
         intersection_data = {
-            "id": self.test_intersection_id,
+            "id": str(self.test_intersection_id),
             "name": "Test Integration Intersection",
             "status": "active"
         }
         
-        self.redis.set(f"intersection:{self.test_intersection_id}", intersection_data)
-        
-        # Verify data was cached in Redis
-        cached_data = self.redis.get(f"intersection:{self.test_intersection_id}")
+        # Write and read back in one round trip to verify data was cached in Redis
+        cached_data = self.redis.set_and_fetch(f"intersection:{self.test_intersection_id}", intersection_data)
         
         self.assertIsNotNone(cached_data)
-        self.assertEqual(cached_data["id"], self.test_intersection_id)
+        self.assertEqual(cached_data["id"], str(self.test_intersection_id))
         self.assertEqual(cached_data["name"], "Test Integration Intersection")
     
     def test_influxdb_to_postgres_analytics(self):
@@ -88,16 +80,14 @@ class TestDatabaseIntegration(unittest.TestCase):
         # Write traffic data to InfluxDB
         current_time = datetime.utcnow()
         
-        # Write multiple data points over a time period
-        for i in range(24):
-            timestamp = current_time - timedelta(hours=i)
-            
-            self.influxdb.write_point(
-                measurement="traffic_volume",
-                tags={"intersection_id": self.test_intersection_id},
-                fields={"value": 100 + (i * 10)},
-                timestamp=timestamp
-            )
+        # Write multiple data points over a time period in one request
+        timestamps = [current_time - timedelta(hours=i) for i in range(24)]
+        tags = {"intersection_id": str(self.test_intersection_id)}
+        
+        self.influxdb.write_points_batch([
+            ("traffic_volume", tags, {"value": 100 + (i * 10)}, timestamp)
+            for i, timestamp in enumerate(timestamps)
+        ])
         
         # Query data from InfluxDB
         query = f'''
@@ -120,10 +110,11 @@ class TestDatabaseIntegration(unittest.TestCase):
             from database.models.postgres_models import OptimizationRun
             
             optimization_run = OptimizationRun(
-                intersection_id=self.test_intersection_id,
                 algorithm="test_algorithm",
-                parameters=json.dumps({"param1": "value1"}),
-                result_data=json.dumps({
+                start_time=datetime.now(timezone.utc),
+                parameters={"param1": "value1"},
+                results={
+                    "intersection_id": str(self.test_intersection_id),
                     "traffic_data": "Simulated data based on InfluxDB query",
                     "optimized_timing": {
                         "cycle_length": 120,
@@ -132,8 +123,7 @@ class TestDatabaseIntegration(unittest.TestCase):
                             {"id": 2, "green_time": 40}
                         ]
                     }
-                }),
-                created_at=datetime.utcnow()
+                }
             )
             
             session.add(optimization_run)
@@ -141,11 +131,14 @@ class TestDatabaseIntegration(unittest.TestCase):
             
             # Verify optimization run was created
             saved_run = session.query(OptimizationRun).filter(
-                OptimizationRun.intersection_id == self.test_intersection_id
+                OptimizationRun.results.contains({"intersection_id": str(self.test_intersection_id)})
             ).first()
             
             self.assertIsNotNone(saved_run)
             self.assertEqual(saved_run.algorithm, "test_algorithm")
+            
+            session.delete(saved_run)
+            session.commit()
 
 
 class TestApiIntegration(unittest.TestCase):
@@ -163,44 +156,39 @@ class TestApiIntegration(unittest.TestCase):
         cls.redis = RedisConnector()
         
         # Create test data
-        cls.test_intersection_id = f"test-api-intersection-{int(time.time())}"
+        cls.test_intersection_id = uuid.uuid4()
         
         # Create test intersection in database
         with cls.postgres.get_session() as session:
-            from database.models.postgres_models import Intersection, Signal
+            from database.models.postgres_models import Intersection, IntersectionType, Signal, SignalStatus
             
             intersection = Intersection(
                 id=cls.test_intersection_id,
                 name="Test API Intersection",
-                location="Test API Location",
-                intersection_type="four_way",
-                is_active=True,
-                created_at=datetime.utcnow()
+                location_lat=0.0,
+                location_lon=0.0,
+                type=IntersectionType.FOUR_WAY.value,
+                lanes_count=4,
+                is_active=True
             )
             
             session.add(intersection)
+            session.flush()
             
-            # Create signals for the intersection
-            signals = [
-                Signal(
-                    id=f"{cls.test_intersection_id}-signal-ns",
-                    intersection_id=cls.test_intersection_id,
-                    direction="N-S",
-                    current_status="RED",
-                    created_at=datetime.utcnow()
-                ),
-                Signal(
-                    id=f"{cls.test_intersection_id}-signal-ew",
-                    intersection_id=cls.test_intersection_id,
-                    direction="E-W",
-                    current_status="GREEN",
-                    created_at=datetime.utcnow()
-                )
-            ]
+            # Create signals for the intersection in one multi-row INSERT
+            session.bulk_insert_mappings(Signal, [
+                {
+                    "id": uuid.uuid4(),
+                    "intersection_id": cls.test_intersection_id,
+                    "position": position,
+                    "default_timing": 30,
+                    "min_timing": 10,
+                    "max_timing": 60,
+                    "current_status": status.value
+                }
+                for position, status in (("north_bound", SignalStatus.RED), ("east_bound", SignalStatus.GREEN))
+            ])
             
-            for signal in signals:
-                session.add(signal)
-                
             session.commit()
     
     @classmethod
@@ -224,32 +212,33 @@ class TestApiIntegration(unittest.TestCase):
         # For this example, we'll skip the actual HTTP requests and simulate the integration
         
         # In a real test, we would do something like:
-        # response = requests.get(f"{self.api_base_url}/signal-control/intersections/{self.test_intersection_id}")
+        # response = requests.get(f"{self.api_base_url}/signals/intersections/{self.test_intersection_id}/status")
         # self.assertEqual(response.status_code, 200)
         # data = response.json()
         # self.assertEqual(data["id"], self.test_intersection_id)
         
         # Instead, we'll verify the test data was created correctly
         with self.postgres.get_session() as session:
-            from database.models.postgres_models import Intersection, Signal
+            from sqlalchemy.orm import selectinload
+            from database.models.postgres_models import Intersection
             
-            intersection = session.query(Intersection).filter(
+            intersection = session.query(Intersection).options(
+                selectinload(Intersection.signals)
+            ).filter(
                 Intersection.id == self.test_intersection_id
             ).first()
             
             self.assertIsNotNone(intersection)
             self.assertEqual(intersection.name, "Test API Intersection")
             
-            signals = session.query(Signal).filter(
-                Signal.intersection_id == self.test_intersection_id
-            ).all()
+            signals = intersection.signals
             
             self.assertEqual(len(signals), 2)
             
-            # Verify signal directions
-            signal_directions = [s.direction for s in signals]
-            self.assertIn("N-S", signal_directions)
-            self.assertIn("E-W", signal_directions)
+            # Verify signal positions
+            signal_positions = [s.position for s in signals]
+            self.assertIn("north_bound", signal_positions)
+            self.assertIn("east_bound", signal_positions)
 
 
 class TestMqttIntegration(unittest.TestCase):
@@ -275,7 +264,7 @@ class TestMqttIntegration(unittest.TestCase):
         }
         
         # Publish message to Redis (simulating MQTT bridge)
-        self.redis.publish("iot:sensor:data", message)
+        self.redis.publish_message("iot:sensor:data", message)
         
         # In a real test, we would verify that the message was processed correctly
         # by checking that the data was stored in InfluxDB and that any necessary
@@ -0,0 +1,38 @@
+"""
+Shared fixtures for unit tests
+"""
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, patch
+
+import pytest
+
+# Database connectors held at module level by each API route module
+ROUTE_BACKENDS = {
+    "signal_control": ("postgres", "redis"),
+    "analytics": ("influxdb", "postgres"),
+    "system": ("postgres", "redis"),
+    "prediction": ("influxdb", "postgres", "redis"),
+}
+
+
+@pytest.fixture
+def mock_backends():
+    """
+    Replace the database connectors of every route module with mocks
+    
+    Each module's connectors are swapped by a single patch.multiple, so one
+    patcher is entered and exited per module rather than one per connector.
+    
+    Returns:
+        Namespace per route module, e.g. mock_backends.signal_control.redis
+    """
+    backends = SimpleNamespace()
+    with ExitStack() as stack:
+        for module_name, attributes in ROUTE_BACKENDS.items():
+            mocks = stack.enter_context(patch.multiple(
+                f"backend.api.routes.{module_name}",
+                **dict.fromkeys(attributes, DEFAULT)
+            ))
+            setattr(backends, module_name, SimpleNamespace(**mocks))
+        yield backends
@@ -0,0 +1,85 @@
+"""
+Helpers shared by unit tests
+"""
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import httpx
+from fastapi import FastAPI
+
+
+def make_session_mock(first=None, all_=None, first_side_effect=None):
+    """
+    Build a session mock whose query(...).filter(...) chain is wired up front
+    
+    Args:
+        first: Result of .first(), left as a MagicMock when None
+        all_: Result of .all(), left as a MagicMock when None
+        first_side_effect: Successive results of .first(), overriding first
+        
+    Returns:
+        Session MagicMock
+    """
+    session = MagicMock()
+    filtered = session.query.return_value.filter.return_value
+    if first is not None:
+        filtered.first.return_value = first
+    if first_side_effect is not None:
+        filtered.first.side_effect = first_side_effect
+    if all_ is not None:
+        filtered.all.return_value = all_
+    return session
+
+
+def make_batch_app(app):
+    """
+    Wrap an app with a POST /batch route that runs many requests in one call
+    
+    The request body is {"requests": [{"id", "method", "url", "body"}, ...]},
+    with method defaulting to GET and body optional. Sub-requests are sent to
+    the wrapped app concurrently, and the response maps each id to its
+    {"status_code", "body"}.
+    
+    Args:
+        app: ASGI application the sub-requests are dispatched to
+        
+    Returns:
+        FastAPI application exposing /batch
+    """
+    batch_app = FastAPI()
+    transport = httpx.ASGITransport(app=app)
+    
+    @batch_app.post("/batch")
+    async def batch(payload: Dict[str, List[Dict[str, Any]]]):
+        requests = payload["requests"]
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            responses = await asyncio.gather(*(
+                client.request(request.get("method", "GET"), request["url"], json=request.get("body"))
+                for request in requests
+            ))
+        return {
+            request["id"]: {"status_code": response.status_code, "body": response.json()}
+            for request, response in zip(requests, responses)
+        }
+        
+    return batch_app
+
+
+def minimal_app(*router_modules):
+    """
+    Build an app mounting only the routers under test
+    
+    Avoids importing backend.api.main, which pulls in every route module and
+    the traffic simulator.
+    
+    Args:
+        router_modules: Route modules exposing a router attribute
+    
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI()
+    for module in router_modules:
+        app.include_router(module.router)
+    return app
@@ -1,372 +1,323 @@
 """
 Unit tests for API routes
 """
-import unittest
-from unittest.mock import MagicMock, patch
-import sys
-import os
+from types import SimpleNamespace as NS
+import pytest
 from fastapi.testclient import TestClient
-from datetime import datetime, timedelta
+from datetime import datetime
 
-# Add project root to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from backend.api.routes import analytics, prediction, signal_control, system
+from helpers import make_batch_app, make_session_mock, minimal_app
 
-from backend.api.main import app
-from database.models.postgres_models import Intersection, Signal, TimingPlan, SystemSettings
+# Fixed timestamp so test data does not depend on the clock
+_NOW = datetime(2023, 1, 1, 12, 0, 0)
 
+# Request bodies built once for the whole module; the routes only read them
+_TIMING_REQUEST = {
+    "north": {"default": 45, "min": 20, "max": 90},
+    "east": {"default": 40, "min": 20, "max": 80}
+}
+_SETTINGS_REQUEST = {
+    "ml_model_type": "mlp_nn",
+    "optimization_algorithm": "genetic",
+    "emergency_vehicle_priority": True,
+    "green_wave_coordination": True,
+    "data_retention_days": 60,
+    "api_endpoint": "http://new-api.example.com",
+    "notification_email": "newemail@example.com"
+}
+_PREDICT_REQUEST = {"intersection_id": "test-intersection-1", "prediction_window": 30}
+_OPTIMIZE_REQUEST = {"intersection_id": "test-intersection-1", "algorithm": "afsa"}
 
-class TestSignalControlRoutes(unittest.TestCase):
-    """Test cases for signal control routes"""
-    
-    def setUp(self):
-        """Set up test environment"""
-        self.client = TestClient(app)
-        
-    @patch('backend.api.routes.signal_control.postgres')
-    @patch('backend.api.routes.signal_control.redis')
-    def test_get_intersection_status(self, mock_redis, mock_postgres):
-        """Test get_intersection_status endpoint"""
-        # Mock PostgreSQL session and query results
-        mock_session = MagicMock()
-        mock_postgres.get_session.return_value.__enter__.return_value = mock_session
-        
-        mock_intersection = MagicMock()
-        mock_intersection.id = "test-intersection-1"
-        mock_intersection.name = "Test Intersection"
-        mock_intersection.location = "Test Location"
-        mock_intersection.intersection_type = "four_way"
-        mock_intersection.is_active = True
-        
-        mock_signals = [
-            MagicMock(id="signal-1", direction="N-S", current_status="GREEN"),
-            MagicMock(id="signal-2", direction="E-W", current_status="RED")
-        ]
-        
-        mock_session.query.return_value.filter.return_value.first.return_value = mock_intersection
-        mock_session.query.return_value.filter.return_value.all.return_value = mock_signals
-        
-        # Mock Redis cache
-        mock_redis.get.return_value = None
-        
-        # Make request
-        response = self.client.get("/signal-control/intersections/test-intersection-1")
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["id"], "test-intersection-1")
-        self.assertEqual(data["name"], "Test Intersection")
-        self.assertEqual(len(data["signals"]), 2)
-        
-    @patch('backend.api.routes.signal_control.postgres')
-    @patch('backend.api.routes.signal_control.redis')
-    def test_update_signal_status(self, mock_redis, mock_postgres):
-        """Test update_signal_status endpoint"""
-        # Mock PostgreSQL session and query results
-        mock_session = MagicMock()
-        mock_postgres.get_session.return_value.__enter__.return_value = mock_session
-        
-        mock_signal = MagicMock()
-        mock_signal.id = "signal-1"
-        mock_signal.direction = "N-S"
-        mock_signal.current_status = "RED"
-        mock_signal.intersection_id = "test-intersection-1"
-        
-        mock_session.query.return_value.filter.return_value.first.return_value = mock_signal
-        
-        # Make request
-        response = self.client.put(
-            "/signal-control/signals/signal-1",
-            json={"status": "GREEN"}
-        )
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["id"], "signal-1")
-        self.assertEqual(data["status"], "GREEN")
-        
-        # Check that signal was updated
-        self.assertEqual(mock_signal.current_status, "GREEN")
-        mock_session.commit.assert_called_once()
-        
-        # Check that Redis was updated
-        mock_redis.publish.assert_called_once()
-        
-    @patch('backend.api.routes.signal_control.postgres')
-    def test_update_timing_plan(self, mock_postgres):
-        """Test update_timing_plan endpoint"""
-        # Mock PostgreSQL session and query results
-        mock_session = MagicMock()
-        mock_postgres.get_session.return_value.__enter__.return_value = mock_session
-        
-        mock_intersection = MagicMock()
-        mock_intersection.id = "test-intersection-1"
-        
-        mock_timing_plan = MagicMock()
-        mock_timing_plan.id = "timing-1"
-        mock_timing_plan.intersection_id = "test-intersection-1"
-        mock_timing_plan.is_active = True
-        
-        mock_session.query.return_value.filter.return_value.first.side_effect = [
-            mock_intersection,  # First query for intersection
-            mock_timing_plan    # Second query for timing plan
-        ]
-        
-        # Make request
-        new_timing_data = {
-            "cycle_length": 120,
-            "phases": [
-                {
-                    "id": 1,
-                    "signals": ["N-S", "S-N"],
-                    "green_time": 45,
-                    "yellow_time": 5,
-                    "red_time": 70
-                },
-                {
-                    "id": 2,
-                    "signals": ["E-W", "W-E"],
-                    "green_time": 40,
-                    "yellow_time": 5,
-                    "red_time": 75
-                }
-            ]
-        }
-        
-        response = self.client.put(
-            "/signal-control/timing-plans/test-intersection-1",
-            json={"timing_data": new_timing_data}
-        )
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["intersection_id"], "test-intersection-1")
-        
-        # Check that timing plan was updated
-        mock_session.commit.assert_called_once()
+# Hourly InfluxDB series returned by the mocked query_data; the routes only read it
+_INFLUX_TIMESERIES = (
+    {"_time": "2023-01-01T12:00:00Z", "_value": 150},
+    {"_time": "2023-01-01T13:00:00Z", "_value": 200}
+)
 
 
-class TestAnalyticsRoutes(unittest.TestCase):
-    """Test cases for analytics routes"""
-    
-    def setUp(self):
-        """Set up test environment"""
-        self.client = TestClient(app)
-        
-    @patch('backend.api.routes.analytics.influxdb')
-    def test_get_traffic_volume(self, mock_influxdb):
-        """Test get_traffic_volume endpoint"""
-        # Mock InfluxDB query results
-        mock_influxdb.query_data.return_value = [
-            {"_time": "2023-01-01T12:00:00Z", "_value": 150},
-            {"_time": "2023-01-01T13:00:00Z", "_value": 200}
-        ]
-        
-        # Make request
-        response = self.client.get("/analytics/traffic-volume/test-intersection-1")
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["intersection_id"], "test-intersection-1")
-        self.assertEqual(len(data["data"]), 2)
-        
-    @patch('backend.api.routes.analytics.influxdb')
-    def test_get_wait_times(self, mock_influxdb):
-        """Test get_wait_times endpoint"""
-        # Mock InfluxDB query results
-        mock_influxdb.query_data.return_value = [
-            {"_time": "2023-01-01T12:00:00Z", "_value": 25.5},
-            {"_time": "2023-01-01T13:00:00Z", "_value": 18.2}
-        ]
-        
-        # Make request
-        response = self.client.get("/analytics/wait-times/test-intersection-1")
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["intersection_id"], "test-intersection-1")
-        self.assertEqual(len(data["data"]), 2)
-        
-    @patch('backend.api.routes.analytics.influxdb')
-    def test_get_vehicle_type_distribution(self, mock_influxdb):
-        """Test get_vehicle_type_distribution endpoint"""
-        # Mock InfluxDB query results
-        mock_influxdb.query_data.return_value = [
-            {"vehicle_type": "car", "_value": 150},
-            {"vehicle_type": "truck", "_value": 30},
-            {"vehicle_type": "bus", "_value": 10},
-            {"vehicle_type": "motorcycle", "_value": 10}
-        ]
-        
-        # Make request
-        response = self.client.get("/analytics/vehicle-types/test-intersection-1")
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["intersection_id"], "test-intersection-1")
-        self.assertEqual(data["total_vehicles"], 200)
-        self.assertEqual(len(data["distribution"]), 4)
+@pytest.fixture(scope="module")
+def signal_control_client():
+    """Test client for the signal control routes"""
+    return TestClient(minimal_app(signal_control))
 
 
-class TestSystemRoutes(unittest.TestCase):
-    """Test cases for system routes"""
-    
-    def setUp(self):
-        """Set up test environment"""
-        self.client = TestClient(app)
-        
-    @patch('backend.api.routes.system.postgres')
-    @patch('backend.api.routes.system.redis')
-    def test_get_system_settings(self, mock_redis, mock_postgres):
-        """Test get_system_settings endpoint"""
-        # Mock Redis cache
-        mock_redis.get.return_value = None
-        
-        # Mock PostgreSQL session and query results
-        mock_session = MagicMock()
-        mock_postgres.get_session.return_value.__enter__.return_value = mock_session
-        
-        mock_settings = MagicMock()
-        mock_settings.id = "settings-1"
-        mock_settings.ml_model_type = "edge_impulse"
-        mock_settings.optimization_algorithm = "afsa"
-        mock_settings.emergency_vehicle_priority = True
-        mock_settings.green_wave_coordination = True
-        mock_settings.data_retention_days = 30
-        mock_settings.api_endpoint = "http://api.example.com"
-        mock_settings.notification_email = "admin@example.com"
-        mock_settings.created_at = datetime.utcnow()
-        mock_settings.updated_at = None
-        
-        mock_session.query.return_value.order_by.return_value.first.return_value = mock_settings
-        
-        # Make request
-        response = self.client.get("/system/settings")
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["ml_model_type"], "edge_impulse")
-        self.assertEqual(data["optimization_algorithm"], "afsa")
-        self.assertTrue(data["emergency_vehicle_priority"])
-        
-    @patch('backend.api.routes.system.postgres')
-    @patch('backend.api.routes.system.redis')
-    def test_update_system_settings(self, mock_redis, mock_postgres):
-        """Test update_system_settings endpoint"""
-        # Mock PostgreSQL session
-        mock_session = MagicMock()
-        mock_postgres.get_session.return_value.__enter__.return_value = mock_session
-        
-        # Make request
-        new_settings = {
-            "ml_model_type": "mlp_nn",
-            "optimization_algorithm": "genetic",
-            "emergency_vehicle_priority": True,
-            "green_wave_coordination": True,
-            "data_retention_days": 60,
-            "api_endpoint": "http://new-api.example.com",
-            "notification_email": "newemail@example.com"
-        }
-        
-        response = self.client.post("/system/settings", json=new_settings)
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["status"], "success")
-        self.assertEqual(data["settings"]["ml_model_type"], "mlp_nn")
-        
-        # Check that settings were added to database
-        mock_session.add.assert_called_once()
-        mock_session.commit.assert_called_once()
-        
-        # Check that Redis was updated
-        mock_redis.set.assert_called_once()
-        mock_redis.publish.assert_called_once()
+def test_get_intersection_status(signal_control_client, mock_backends):
+    """Test get_intersection_status endpoint"""
+    mock_redis = mock_backends.signal_control.redis
+    mock_postgres = mock_backends.signal_control.postgres
+    
+    # Mock PostgreSQL query results
+    mock_signals = [
+        NS(id="signal-1", position="north", current_status="green", last_status_change=_NOW),
+        NS(id="signal-2", position="east", current_status="red", last_status_change=_NOW)
+    ]
+    
+    mock_session = make_session_mock(all_=mock_signals)
+    mock_postgres.get_session.return_value.__enter__.return_value = mock_session
+    
+    # Mock Redis cache miss
+    mock_redis.get_intersection_status.return_value = None
+    
+    # Make request
+    response = signal_control_client.get("/signals/intersections/test-intersection-1/status")
+    
+    # Check response
+    assert response.status_code == 200
+    data = response.json()
+    assert data["intersection_id"] == "test-intersection-1"
+    assert len(data["signals"]) == 2
+    assert data["signals"][0]["status"] == "green"
+    assert data["timestamp"].endswith("+00:00")
+    
+    # Check that the status was cached
+    mock_redis.set_intersection_status.assert_called_once()
 
 
-class TestPredictionRoutes(unittest.TestCase):
-    """Test cases for prediction routes"""
-    
-    def setUp(self):
-        """Set up test environment"""
-        self.client = TestClient(app)
-        
-    @patch('backend.api.routes.prediction.redis')
-    @patch('backend.api.routes.prediction.influxdb')
-    def test_predict_traffic_flow(self, mock_influxdb, mock_redis):
-        """Test predict_traffic_flow endpoint"""
-        # Mock Redis cache
-        mock_redis.get.return_value = {"ml_model_type": "edge_impulse"}
-        
-        # Mock InfluxDB query results
-        mock_influxdb.query_data.return_value = [
-            {"_time": "2023-01-01T12:00:00Z", "_value": 150},
-            {"_time": "2023-01-01T13:00:00Z", "_value": 200}
-        ]
-        
-        # Make request
-        response = self.client.post(
-            "/prediction/traffic-flow",
-            json={"intersection_id": "test-intersection-1", "prediction_window": 30}
-        )
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["intersection_id"], "test-intersection-1")
-        self.assertEqual(data["model_type"], "edge_impulse")
-        self.assertEqual(len(data["predictions"]), 30)
-        
-    @patch('backend.api.routes.prediction.postgres')
-    @patch('backend.api.routes.prediction.influxdb')
-    def test_optimize_timing(self, mock_influxdb, mock_postgres):
-        """Test optimize_timing endpoint"""
-        # Mock PostgreSQL session and query results
-        mock_session = MagicMock()
-        mock_postgres.get_session.return_value.__enter__.return_value = mock_session
-        
-        mock_intersection = MagicMock()
-        mock_intersection.id = "test-intersection-1"
-        mock_intersection.intersection_type = "four_way"
-        
-        mock_signals = [
-            MagicMock(id="signal-1", direction="N-S", current_status="GREEN"),
-            MagicMock(id="signal-2", direction="E-W", current_status="RED")
-        ]
-        
-        mock_timing_plan = MagicMock()
-        mock_timing_plan.timing_data = '{"cycle_length": 120}'
-        
-        mock_session.query.return_value.filter.return_value.first.return_value = mock_intersection
-        mock_session.query.return_value.filter.return_value.all.return_value = mock_signals
-        
-        # Mock InfluxDB query results
-        mock_influxdb.query_data.return_value = [
-            {"_time": "2023-01-01T12:00:00Z", "_value": 150},
-            {"_time": "2023-01-01T13:00:00Z", "_value": 200}
-        ]
-        
-        # Make request
-        response = self.client.post(
-            "/prediction/optimize",
-            json={"intersection_id": "test-intersection-1", "algorithm": "afsa"}
-        )
-        
-        # Check response
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["intersection_id"], "test-intersection-1")
-        self.assertEqual(data["algorithm"], "afsa")
-        self.assertIn("optimized_timing", data)
-        self.assertIn("estimated_improvements", data)
+def test_update_signal_status(signal_control_client, mock_backends):
+    """Test update_signal_status endpoint"""
+    mock_redis = mock_backends.signal_control.redis
+    mock_postgres = mock_backends.signal_control.postgres
+    
+    # Mock PostgreSQL query results
+    mock_signal = NS(
+        id="signal-1",
+        position="north",
+        current_status="red",
+        last_status_change=_NOW,
+        intersection_id="test-intersection-1"
+    )
+    
+    mock_session = make_session_mock(first=mock_signal)
+    mock_postgres.get_session.return_value.__enter__.return_value = mock_session
+    
+    # Make request
+    response = signal_control_client.put(
+        "/signals/intersections/test-intersection-1/signals/signal-1",
+        params={"status": "green"}
+    )
+    
+    # Check response
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == "signal-1"
+    assert data["status"] == "green"
+    
+    # Check that signal was updated
+    assert mock_signal.current_status == "green"
+    
+    # Check that the cache was invalidated and the change published
+    mock_redis.delete_key.assert_called_once_with("intersection:test-intersection-1:status")
+    mock_redis.publish_message.assert_called_once()
 
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+def test_update_timing_plan(signal_control_client, mock_backends):
+    """Test update_timing_plan endpoint"""
+    mock_redis = mock_backends.signal_control.redis
+    mock_postgres = mock_backends.signal_control.postgres
+    
+    # Mock PostgreSQL query results
+    mock_intersection = NS(id="test-intersection-1")
+    
+    mock_signals = [
+        NS(position="north", default_timing=30, min_timing=10, max_timing=60),
+        NS(position="west", default_timing=30, min_timing=10, max_timing=60)
+    ]
+    
+    mock_session = make_session_mock(first=mock_intersection, all_=mock_signals)
+    mock_postgres.get_session.return_value.__enter__.return_value = mock_session
+    
+    # Make request
+    response = signal_control_client.post(
+        "/signals/intersections/test-intersection-1/timing",
+        json=_TIMING_REQUEST
+    )
+    
+    # Check response
+    assert response.status_code == 200
+    
+    # Check that only the signals named in the plan were updated
+    assert mock_signals[0].default_timing == 45
+    assert mock_signals[0].max_timing == 90
+    assert mock_signals[1].default_timing == 30
+    
+    # Check that the plan was published to edge devices
+    mock_redis.publish_message.assert_called_once_with(
+        "intersection:test-intersection-1:timing_update",
+        _TIMING_REQUEST
+    )
+
+
+@pytest.fixture(scope="module")
+def system_client():
+    """Test client for the system routes"""
+    return TestClient(minimal_app(system))
+
+
+def test_get_system_settings(system_client, mock_backends):
+    """Test get_system_settings endpoint"""
+    mock_redis = mock_backends.system.redis
+    mock_postgres = mock_backends.system.postgres
+    
+    # Mock Redis cache miss
+    mock_redis.get_value.return_value = None
+    
+    # Mock the key/value settings rows
+    mock_rows = [
+        NS(key="ml_model_type", value='"edge_impulse"', updated_at=_NOW),
+        NS(key="optimization_algorithm", value='"afsa"', updated_at=_NOW),
+        NS(key="emergency_vehicle_priority", value="true", updated_at=_NOW),
+        NS(key="data_retention_days", value="30", updated_at=_NOW)
+    ]
+    
+    mock_session = make_session_mock(all_=mock_rows)
+    mock_postgres.get_session.return_value.__enter__.return_value = mock_session
+    
+    # Make request
+    response = system_client.get("/system/settings")
+    
+    # Check response
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ml_model_type"] == "edge_impulse"
+    assert data["optimization_algorithm"] == "afsa"
+    assert data["emergency_vehicle_priority"] is True
+    assert data["data_retention_days"] == 30
+    assert data["api_endpoint"] is None
+    
+    # Check that the settings were cached
+    mock_redis.set_value.assert_called_once_with("system:settings", data, expiry=3600)
+
+
+def test_get_system_settings_not_found(system_client, mock_backends):
+    """Test get_system_settings endpoint with no settings stored"""
+    mock_backends.system.redis.get_value.return_value = None
+    mock_session = make_session_mock(all_=[])
+    mock_backends.system.postgres.get_session.return_value.__enter__.return_value = mock_session
+    
+    response = system_client.get("/system/settings")
+    
+    assert response.status_code == 404
+
+
+def test_update_system_settings(system_client, mock_backends):
+    """Test update_system_settings endpoint"""
+    mock_redis = mock_backends.system.redis
+    mock_postgres = mock_backends.system.postgres
+    
+    # Mock one existing row; the other settings are new
+    existing_row = NS(key="ml_model_type", value='"edge_impulse"')
+    mock_session = make_session_mock(all_=[existing_row])
+    mock_postgres.get_session.return_value.__enter__.return_value = mock_session
+    
+    # Make request
+    response = system_client.post("/system/settings", json=_SETTINGS_REQUEST)
+    
+    # Check response
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "success"
+    assert data["settings"]["ml_model_type"] == "mlp_nn"
+    
+    # Check that the existing row was updated and the others added
+    assert existing_row.value == '"mlp_nn"'
+    new_rows = mock_session.add_all.call_args.args[0]
+    assert {row.key for row in new_rows} == set(_SETTINGS_REQUEST) - {"ml_model_type"}
+    mock_session.commit.assert_called_once()
+    
+    # Check that Redis was updated
+    mock_redis.set_value.assert_called_once()
+    mock_redis.publish_message.assert_called_once()
+
+
+@pytest.fixture(scope="module")
+def prediction_client():
+    """Test client for the prediction routes"""
+    return TestClient(minimal_app(prediction))
+
+
+def test_optimize_timing(prediction_client, mock_backends):
+    """Test optimize_timing endpoint"""
+    mock_influxdb = mock_backends.prediction.influxdb
+    mock_postgres = mock_backends.prediction.postgres
+    
+    # Mock PostgreSQL query results
+    mock_intersection = NS(
+        id="test-intersection-1",
+        type="four_way"
+    )
+    
+    mock_signals = [
+        NS(id="signal-1", position="north", current_status="green"),
+        NS(id="signal-2", position="east", current_status="red")
+    ]
+    
+    mock_session = make_session_mock(first=mock_intersection, all_=mock_signals)
+    mock_postgres.get_session.return_value.__enter__.return_value = mock_session
+    
+    # Mock InfluxDB query results
+    mock_influxdb.query_data.return_value = _INFLUX_TIMESERIES
+    
+    # Make request
+    response = prediction_client.post("/prediction/optimize", json=_OPTIMIZE_REQUEST)
+    
+    # Check response
+    assert response.status_code == 200
+    data = response.json()
+    assert data["intersection_id"] == "test-intersection-1"
+    assert data["algorithm"] == "afsa"
+    assert "optimized_timing" in data
+    assert "estimated_improvements" in data
+    
+    # Check that the run was recorded
+    mock_session.add.assert_called_once()
+
+
+@pytest.fixture(scope="module")
+def batch_client():
+    """Test client for the batched analytics and prediction requests"""
+    return TestClient(make_batch_app(minimal_app(analytics, prediction)))
+
+
+def test_analytics_batch(batch_client, mock_backends):
+    """Test the analytics and traffic flow endpoints through a single /batch call"""
+    mock_analytics_influxdb = mock_backends.analytics.influxdb
+    mock_prediction_influxdb = mock_backends.prediction.influxdb
+    mock_prediction_redis = mock_backends.prediction.redis
+    
+    # Mock InfluxDB query results and Redis cache
+    mock_analytics_influxdb.query_data.return_value = _INFLUX_TIMESERIES
+    mock_analytics_influxdb.query_data_iter.return_value = [
+        {"vehicle_type": "car", "_value": 150},
+        {"vehicle_type": "truck", "_value": 30},
+        {"vehicle_type": "bus", "_value": 10},
+        {"vehicle_type": "motorcycle", "_value": 10}
+    ]
+    mock_prediction_influxdb.query_data.return_value = _INFLUX_TIMESERIES
+    mock_prediction_redis.get_value.return_value = {"ml_model_type": "edge_impulse"}
+    
+    # Make request
+    response = batch_client.post("/batch", json={"requests": [
+        {"id": "volume", "url": "/analytics/traffic-volume/test-intersection-1"},
+        {"id": "wait", "url": "/analytics/wait-times/test-intersection-1"},
+        {"id": "types", "url": "/analytics/vehicle-types/test-intersection-1"},
+        {
+            "id": "flow",
+            "method": "POST",
+            "url": "/prediction/traffic-flow",
+            "body": _PREDICT_REQUEST
+        }
+    ]})
+    
+    # Check responses
+    assert response.status_code == 200
+    results = response.json()
+    for request_id in ("volume", "wait", "types", "flow"):
+        assert results[request_id]["status_code"] == 200
+        assert results[request_id]["body"]["intersection_id"] == "test-intersection-1"
+    assert len(results["volume"]["body"]["data"]) == 2
+    assert len(results["wait"]["body"]["data"]) == 2
+    assert results["types"]["body"]["total_vehicles"] == 200
+    assert len(results["types"]["body"]["distribution"]) == 4
+    assert results["flow"]["body"]["model_type"] == "edge_impulse"
+    assert len(results["flow"]["body"]["predictions"]) == 30
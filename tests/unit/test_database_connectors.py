@@ -2,49 +2,76 @@
 Unit tests for database connectors
 """
 import unittest
-from unittest.mock import MagicMock, patch
-import sys
-import os
+from unittest.mock import AsyncMock, MagicMock, patch
+import copy
+import csv
+import io
 import json
+import uuid
 from datetime import datetime
 
-# Add project root to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from influxdb_client.client.exceptions import InfluxDBError
 
 from database.connectors.postgres_connector import PostgresConnector
 from database.connectors.influxdb_connector import InfluxDBConnector
 from database.connectors.redis_connector import RedisConnector
+from database.models.postgres_models import Intersection
+
+# The async connector needs SQLAlchemy's asyncio extra (greenlet)
+try:
+    from database.connectors.async_postgres_connector import AsyncPostgresConnector
+except ImportError:
+    AsyncPostgresConnector = None
+from helpers import make_session_mock
+
+# Fixed timestamp so test data does not depend on the clock
+_NOW = datetime(2023, 1, 1, 12, 0, 0)
+
+# Session factory mock wired once up front; get_session yields the session the
+# factory returns, so tests use _SESSION_PROTOTYPE.return_value directly
+_SESSION_PROTOTYPE = MagicMock(return_value=make_session_mock())
+
+# Redis payload and its serialized form, encoded once for the Redis tests
+_TEST_DICT = {"name": "test", "value": 123}
+_TEST_DICT_BYTES = json.dumps(_TEST_DICT).encode()
 
 
 class TestPostgresConnector(unittest.TestCase):
     """Test cases for PostgresConnector"""
     
-    @patch('database.connectors.postgres_connector.create_engine')
-    @patch('database.connectors.postgres_connector.sessionmaker')
-    def setUp(self, mock_sessionmaker, mock_create_engine):
+    @classmethod
+    def setUpClass(cls):
+        """Build one connector on a mocked engine and sessionmaker for the class"""
+        cls.mock_engine = MagicMock()
+        cls.mock_session = _SESSION_PROTOTYPE
+        with patch('database.connectors.postgres_connector.create_engine', return_value=cls.mock_engine), \
+                patch('database.connectors.postgres_connector.sessionmaker', return_value=cls.mock_session):
+            cls.cached_connector = PostgresConnector()
+    
+    def setUp(self):
         """Set up test environment"""
-        self.mock_engine = MagicMock()
-        self.mock_session = MagicMock()
-        mock_create_engine.return_value = self.mock_engine
-        mock_sessionmaker.return_value = self.mock_session
-        
-        self.connector = PostgresConnector()
+        self.mock_engine.reset_mock()
+        self.mock_session.reset_mock()
+        self.connector = copy.copy(self.cached_connector)
     
     def test_get_session(self):
         """Test get_session method"""
-        self.connector.get_session()
+        with self.connector.get_session() as session:
+            self.assertIs(session, self.mock_session.return_value)
+            
         self.mock_session.assert_called_once()
+        session.commit.assert_called_once()
+        session.close.assert_called_once()
     
     @patch('database.connectors.postgres_connector.Base')
     def test_create_tables(self, mock_base):
         """Test create_tables method"""
         self.connector.create_tables()
-        mock_base.metadata.create_all.assert_called_once_with(self.mock_engine)
+        mock_base.metadata.create_all.assert_called_once_with(bind=self.mock_engine)
     
     def test_add_item(self):
         """Test add_item method"""
-        mock_session = MagicMock()
-        self.mock_session.return_value.__enter__.return_value = mock_session
+        mock_session = _SESSION_PROTOTYPE.return_value
         
         test_item = MagicMock()
         self.connector.add_item(test_item)
@@ -52,189 +79,415 @@ class TestPostgresConnector(unittest.TestCase):
         mock_session.add.assert_called_once_with(test_item)
         mock_session.commit.assert_called_once()
     
-    def test_get_item(self):
-        """Test get_item method"""
-        mock_session = MagicMock()
-        self.mock_session.return_value.__enter__.return_value = mock_session
+    def test_get_by_id(self):
+        """Test get_by_id method"""
+        mock_session = _SESSION_PROTOTYPE.return_value
+        mock_session.get.return_value = "test_result"
         
         mock_model = MagicMock()
-        mock_query = MagicMock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value.first.return_value = "test_result"
-        
-        result = self.connector.get_item(mock_model, id="test_id")
+        result = self.connector.get_by_id(mock_model, "test_id")
         
-        mock_session.query.assert_called_once_with(mock_model)
+        mock_session.get.assert_called_once_with(mock_model, "test_id")
         self.assertEqual(result, "test_result")
     
-    def test_update_item(self):
+    @patch('database.connectors.postgres_connector.update')
+    def test_update_item(self, mock_update):
         """Test update_item method"""
-        mock_session = MagicMock()
-        self.mock_session.return_value.__enter__.return_value = mock_session
+        mock_session = _SESSION_PROTOTYPE.return_value
+        mock_session.execute.return_value.rowcount = 1
         
         mock_model = MagicMock()
-        mock_query = MagicMock()
-        mock_item = MagicMock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value.first.return_value = mock_item
+        mock_model.__table__ = MagicMock()
+        mock_model.__table__.columns = {"name": MagicMock(), "value": MagicMock()}
         
-        update_data = {"name": "new_name", "value": 123}
-        result = self.connector.update_item(mock_model, update_data, id="test_id")
+        update_data = {"name": "new_name", "value": 123, "unknown": "ignored"}
+        result = self.connector.update_item(mock_model, "test_id", update_data)
         
-        mock_session.query.assert_called_once_with(mock_model)
-        self.assertEqual(mock_item.name, "new_name")
-        self.assertEqual(mock_item.value, 123)
+        mock_update.return_value.where.return_value.values.assert_called_once_with(
+            {"name": "new_name", "value": 123}
+        )
+        mock_session.execute.assert_called_once()
         mock_session.commit.assert_called_once()
-        self.assertEqual(result, mock_item)
+        self.assertTrue(result)
+    
+    def test_bulk_insert_mappings(self):
+        """Test bulk_insert_mappings method"""
+        mock_connection = MagicMock()
+        self.mock_engine.begin.return_value.__enter__.return_value = mock_connection
+        
+        mock_model = MagicMock()
+        mock_model.__table__ = MagicMock()
+        rows = [{"name": "a"}, {"name": "b"}]
+        result = self.connector.bulk_insert_mappings(mock_model, rows)
+        
+        mock_connection.execute.assert_called_once_with(
+            mock_model.__table__.insert.return_value, rows
+        )
+        self.assertTrue(result)
+    
+    @patch('database.connectors.postgres_connector.COPY_THRESHOLD', 1)
+    def test_bulk_insert_mappings_copy(self):
+        """Test bulk_insert_mappings loads rows above the threshold through COPY"""
+        cursor = self.mock_engine.raw_connection.return_value.cursor.return_value
+        rows = [
+            {"name": "", "location_lat": 1.0, "location_lon": 2.0, "type": "four_way", "lanes_count": 4},
+            {"name": 'Main "St"', "location_lat": 1.5, "location_lon": 2.5, "type": "three_way", "lanes_count": 3,
+             "config": {"phases": 2}}
+        ]
+        result = self.connector.bulk_insert_mappings(Intersection, rows)
+        
+        # Union of row keys plus Python-side defaults; server defaults are left out
+        copy_sql, buffer = cursor.copy_expert.call_args[0]
+        self.assertEqual(
+            copy_sql,
+            "COPY intersections (id, name, location_lat, location_lon, type, lanes_count, is_active, config) "
+            "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        )
+        
+        first, second = csv.reader(io.StringIO(buffer.getvalue()))
+        for record in (first, second):
+            uuid.UUID(record[0])
+            self.assertEqual(record[6], "True")
+        self.assertEqual(first[7], "\\N")
+        self.assertEqual(second[1], 'Main "St"')
+        self.assertEqual(json.loads(second[7]), {"phases": 2})
+        
+        # The empty name is quoted, so COPY keeps it as text instead of NULL
+        self.assertEqual(buffer.getvalue().splitlines()[0].split(",")[1], '""')
+        self.assertTrue(result)
+
+@unittest.skipIf(AsyncPostgresConnector is None, "SQLAlchemy asyncio support is not installed")
+class TestAsyncPostgresConnector(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncPostgresConnector"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Build one connector on a mocked async engine for the class"""
+        cls.mock_engine = MagicMock()
+        with patch('database.connectors.async_postgres_connector.create_async_engine', return_value=cls.mock_engine):
+            cls.cached_connector = AsyncPostgresConnector()
+    
+    def setUp(self):
+        """Set up test environment"""
+        self.mock_engine.reset_mock()
+        
+        # Session with the awaitable methods the connector calls
+        self.mock_session = MagicMock()
+        for method in ("get", "execute", "commit", "rollback", "close"):
+            setattr(self.mock_session, method, AsyncMock())
+            
+        self.connector = copy.copy(self.cached_connector)
+        self.connector.SessionLocal = MagicMock(return_value=self.mock_session)
+    
+    async def test_add_items(self):
+        """Test add_items method"""
+        items = [MagicMock(), MagicMock()]
+        result = await self.connector.add_items(items)
+        
+        self.mock_session.add_all.assert_called_once_with(items)
+        self.mock_session.commit.assert_awaited_once()
+        self.mock_session.close.assert_awaited_once()
+        self.assertTrue(result)
+    
+    async def test_get_by_id(self):
+        """Test get_by_id method"""
+        self.mock_session.get.return_value = "test_result"
+        
+        mock_model = MagicMock()
+        result = await self.connector.get_by_id(mock_model, "test_id")
+        
+        self.mock_session.get.assert_awaited_once_with(mock_model, "test_id")
+        self.assertEqual(result, "test_result")
+    
+    @patch('database.connectors.async_postgres_connector.update')
+    async def test_update_item(self, mock_update):
+        """Test update_item method"""
+        self.mock_session.execute.return_value.rowcount = 1
+        
+        mock_model = MagicMock()
+        mock_model.__table__ = MagicMock()
+        mock_model.__table__.columns = {"name": MagicMock(), "value": MagicMock()}
+        
+        update_data = {"name": "new_name", "value": 123, "unknown": "ignored"}
+        result = await self.connector.update_item(mock_model, "test_id", update_data)
+        
+        mock_update.return_value.where.return_value.values.assert_called_once_with(
+            {"name": "new_name", "value": 123}
+        )
+        self.mock_session.execute.assert_awaited_once()
+        self.mock_session.commit.assert_awaited_once()
+        self.assertTrue(result)
+    
+    @patch('database.connectors.async_postgres_connector.update')
+    async def test_update_item_missing(self, mock_update):
+        """Test update_item method when no row matches"""
+        self.mock_session.execute.return_value.rowcount = 0
+        
+        mock_model = MagicMock()
+        mock_model.__table__ = MagicMock()
+        mock_model.__table__.columns = {"name": MagicMock()}
+        
+        result = await self.connector.update_item(mock_model, "test_id", {"name": "new_name"})
+        
+        self.assertFalse(result)
+    
+    @patch('database.connectors.async_postgres_connector.delete')
+    async def test_delete_item(self, mock_delete):
+        """Test delete_item method"""
+        self.mock_session.execute.return_value.rowcount = 1
+        
+        mock_model = MagicMock()
+        result = await self.connector.delete_item(mock_model, "test_id")
+        
+        mock_delete.assert_called_once_with(mock_model)
+        self.mock_session.execute.assert_awaited_once_with(mock_delete.return_value.where.return_value)
+        self.mock_session.commit.assert_awaited_once()
+        self.assertTrue(result)
+    
+    async def test_execute_raw_query(self):
+        """Test execute_raw_query method"""
+        mock_connection = MagicMock()
+        mock_connection.execute = AsyncMock(return_value=MagicMock())
+        mock_connection.execute.return_value.mappings.return_value = [
+            {"id": 1, "name": "a"},
+            {"id": 2, "name": "b"}
+        ]
+        self.mock_engine.connect.return_value.__aenter__.return_value = mock_connection
+        
+        result = await self.connector.execute_raw_query("SELECT id, name FROM t WHERE id > :id", {"id": 0})
+        
+        query, params = mock_connection.execute.call_args[0]
+        self.assertEqual(str(query), "SELECT id, name FROM t WHERE id > :id")
+        self.assertEqual(params, {"id": 0})
+        self.assertEqual(result, [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
 
 
 class TestInfluxDBConnector(unittest.TestCase):
     """Test cases for InfluxDBConnector"""
     
-    @patch('database.connectors.influxdb_connector.InfluxDBClient')
-    def setUp(self, mock_influxdb_client):
+    @classmethod
+    def setUpClass(cls):
+        """Build one connector on a mocked client for the class"""
+        cls.mock_client = MagicMock()
+        with patch('database.connectors.influxdb_connector.InfluxDBClient', return_value=cls.mock_client):
+            cls.cached_connector = InfluxDBConnector()
+    
+    def setUp(self):
         """Set up test environment"""
-        self.mock_client = MagicMock()
-        mock_influxdb_client.return_value = self.mock_client
-        
-        self.connector = InfluxDBConnector()
+        # The client calls made by the constructor stay recorded; only the
+        # write and query APIs the connector holds start fresh
+        self.mock_client.write_api.return_value.reset_mock()
+        self.mock_client.query_api.return_value.reset_mock()
+        self.connector = copy.copy(self.cached_connector)
     
-    def test_write_point(self):
-        """Test write_point method"""
-        self.mock_client.write_api.return_value = MagicMock()
-        
-        self.connector.write_point(
+    def test_write_data_point(self):
+        """Test write_data_point method"""
+        result = self.connector.write_data_point(
             measurement="test_measurement",
             tags={"tag1": "value1"},
             fields={"field1": 123},
-            timestamp=datetime.utcnow()
+            timestamp=_NOW
         )
         
+        self.assertTrue(result)
         self.mock_client.write_api.assert_called_once()
-        self.mock_client.write_api.return_value.write.assert_called_once()
+        self.connector.write_api.write.assert_called_once()
+        self.assertEqual(self.connector.write_api.write.call_args.kwargs["bucket"], self.connector.bucket)
     
     def test_write_batch(self):
         """Test write_batch method"""
-        self.mock_client.write_api.return_value = MagicMock()
-        
         points = [
-            {
-                "measurement": "test_measurement",
-                "tags": {"tag1": "value1"},
-                "fields": {"field1": 123},
-                "timestamp": datetime.utcnow()
-            },
-            {
-                "measurement": "test_measurement",
-                "tags": {"tag2": "value2"},
-                "fields": {"field2": 456},
-                "timestamp": datetime.utcnow()
-            }
+            InfluxDBConnector._build_point("test_measurement", {"tag1": "value1"}, {"field1": 123}, _NOW),
+            InfluxDBConnector._build_point("test_measurement", {"tag2": "value2"}, {"field2": 456}, _NOW)
         ]
         
-        self.connector.write_batch(points)
+        result = self.connector.write_batch(points)
         
+        self.assertTrue(result)
         self.mock_client.write_api.assert_called_once()
-        self.mock_client.write_api.return_value.write.assert_called_once()
+        self.connector.write_api.write.assert_called_once_with(bucket=self.connector.bucket, record=points)
     
     def test_query_data(self):
         """Test query_data method"""
-        mock_query_api = MagicMock()
-        self.mock_client.query_api.return_value = mock_query_api
-        mock_query_api.query.return_value = ["test_result"]
+        mock_record = MagicMock(**{
+            "get_time.return_value": "test_time",
+            "get_measurement.return_value": "test_measurement",
+            "values": {"_value": 1},
+        })
+        self.mock_client.query_api.return_value.query_stream.return_value = iter([mock_record])
         
         result = self.connector.query_data("test_query")
         
         self.mock_client.query_api.assert_called_once()
-        mock_query_api.query.assert_called_once()
-        self.assertEqual(result, ["test_result"])
+        self.mock_client.query_api.return_value.query_stream.assert_called_once()
+        self.assertEqual(result, [
+            {"time": "test_time", "measurement": "test_measurement", "_value": 1}
+        ])
+    
+    def test_query_data_iter_raises_mid_stream(self):
+        """Test query_data_iter re-raises an error after records were yielded"""
+        mock_record = MagicMock(**{
+            "get_time.return_value": "test_time",
+            "get_measurement.return_value": "test_measurement",
+            "values": {"_value": 1},
+        })
+        
+        def stream():
+            yield mock_record
+            raise InfluxDBError(message="connection reset")
+        
+        self.mock_client.query_api.return_value.query_stream.return_value = stream()
+        records = self.connector.query_data_iter("test_query")
+        
+        self.assertEqual(next(records)["_value"], 1)
+        with self.assertRaises(InfluxDBError):
+            next(records)
+    
+    def test_query_data_error(self):
+        """Test query_data returns no partial result on error"""
+        def stream():
+            yield MagicMock(values={"_value": 1})
+            raise InfluxDBError(message="connection reset")
+        
+        self.mock_client.query_api.return_value.query_stream.return_value = stream()
+        
+        self.assertEqual(self.connector.query_data("test_query"), [])
 
 
 class TestRedisConnector(unittest.TestCase):
     """Test cases for RedisConnector"""
     
-    @patch('database.connectors.redis_connector.redis.Redis')
-    def setUp(self, mock_redis):
+    @classmethod
+    def setUpClass(cls):
+        """Build one connector on a mocked Redis client for the class"""
+        cls.mock_client = MagicMock()
+        with patch('database.connectors.redis_connector.redis.Redis', return_value=cls.mock_client):
+            cls.cached_connector = RedisConnector()
+    
+    def setUp(self):
         """Set up test environment"""
-        self.mock_client = MagicMock()
-        mock_redis.return_value = self.mock_client
-        
-        self.connector = RedisConnector()
+        self.mock_client.reset_mock()
+        self.cached_connector._status_cache.clear()
+        self.connector = copy.copy(self.cached_connector)
     
-    def test_set(self):
-        """Test set method"""
+    def test_set_value(self):
+        """Test set_value method"""
         self.mock_client.set.return_value = True
         
-        result = self.connector.set("test_key", "test_value")
+        result = self.connector.set_value("test_key", "test_value")
         
         self.mock_client.set.assert_called_once()
         self.assertTrue(result)
     
-    def test_set_with_dict(self):
-        """Test set method with dict value"""
+    def test_set_value_with_dict(self):
+        """Test set_value method with dict value"""
         self.mock_client.set.return_value = True
         
-        test_dict = {"name": "test", "value": 123}
-        result = self.connector.set("test_key", test_dict)
+        result = self.connector.set_value("test_key", _TEST_DICT)
         
         self.mock_client.set.assert_called_once()
         # Check that the value was JSON serialized
         args, kwargs = self.mock_client.set.call_args
         self.assertEqual(args[0], "test_key")
-        self.assertEqual(json.loads(args[1]), test_dict)
+        self.assertEqual(args[1], _TEST_DICT_BYTES.decode())
         self.assertTrue(result)
     
-    def test_get(self):
-        """Test get method"""
-        self.mock_client.get.return_value = b"test_value"
+    def test_get_value(self):
+        """Test get_value method"""
+        self.mock_client.get.return_value = "test_value"
         
-        result = self.connector.get("test_key")
+        result = self.connector.get_value("test_key")
         
         self.mock_client.get.assert_called_once_with("test_key")
         self.assertEqual(result, "test_value")
     
-    def test_get_with_json(self):
-        """Test get method with JSON value"""
-        test_dict = {"name": "test", "value": 123}
-        self.mock_client.get.return_value = json.dumps(test_dict).encode()
+    def test_get_value_with_json(self):
+        """Test get_value method with JSON value"""
+        self.mock_client.get.return_value = _TEST_DICT_BYTES
         
-        result = self.connector.get("test_key")
+        result = self.connector.get_value("test_key")
         
         self.mock_client.get.assert_called_once_with("test_key")
-        self.assertEqual(result, test_dict)
+        self.assertEqual(result, _TEST_DICT)
     
-    def test_delete(self):
-        """Test delete method"""
+    def test_delete_key(self):
+        """Test delete_key method"""
         self.mock_client.delete.return_value = 1
         
-        result = self.connector.delete("test_key")
+        result = self.connector.delete_key("test_key")
         
         self.mock_client.delete.assert_called_once_with("test_key")
-        self.assertEqual(result, 1)
+        self.assertTrue(result)
     
-    def test_publish(self):
-        """Test publish method"""
+    def test_publish_message(self):
+        """Test publish_message method"""
         self.mock_client.publish.return_value = 1
         
-        result = self.connector.publish("test_channel", "test_message")
+        result = self.connector.publish_message("test_channel", "test_message")
         
-        self.mock_client.publish.assert_called_once()
-        self.assertEqual(result, 1)
+        self.mock_client.publish.assert_called_once_with("test_channel", "test_message")
+        self.assertTrue(result)
     
-    def test_publish_with_dict(self):
-        """Test publish method with dict message"""
+    def test_publish_message_with_dict(self):
+        """Test publish_message method with dict message"""
         self.mock_client.publish.return_value = 1
         
-        test_dict = {"name": "test", "value": 123}
-        result = self.connector.publish("test_channel", test_dict)
+        result = self.connector.publish_message("test_channel", _TEST_DICT)
         
         self.mock_client.publish.assert_called_once()
         # Check that the message was JSON serialized
         args, kwargs = self.mock_client.publish.call_args
         self.assertEqual(args[0], "test_channel")
-        self.assertEqual(json.loads(args[1]), test_dict)
-        self.assertEqual(result, 1)
-
+        self.assertEqual(args[1], _TEST_DICT_BYTES.decode())
+        self.assertTrue(result)
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    
+    def test_set_and_fetch(self):
+        """Test set_and_fetch writes and reads back through one pipeline"""
+        pipe = self.mock_client.pipeline.return_value.__enter__.return_value
+        pipe.execute.return_value = [True, _TEST_DICT_BYTES]
+        
+        result = self.connector.set_and_fetch("test_key", _TEST_DICT)
+        
+        pipe.set.assert_called_once_with("test_key", _TEST_DICT_BYTES.decode(), ex=None)
+        pipe.get.assert_called_once_with("test_key")
+        pipe.execute.assert_called_once()
+        self.assertEqual(result, _TEST_DICT)
+    
+    def test_get_intersection_status_cached(self):
+        """Test get_intersection_status serves repeat reads from the local cache"""
+        status = {"intersection_id": "test-intersection-1", "signals": []}
+        self.mock_client.get.return_value = json.dumps(status)
+        
+        self.assertEqual(self.connector.get_intersection_status("test-intersection-1"), status)
+        self.assertEqual(self.connector.get_intersection_status("test-intersection-1"), status)
+        self.mock_client.get.assert_called_once_with("intersection:test-intersection-1:status")
+        
+        self.connector.delete_key("intersection:test-intersection-1:status")
+        self.connector.get_intersection_status("test-intersection-1")
+        self.assertEqual(self.mock_client.get.call_count, 2)
+    
+    def test_get_intersection_status_returns_copy(self):
+        """Test callers cannot modify the cached intersection status"""
+        status = {"intersection_id": "test-intersection-1", "signals": [{"id": "signal-1"}]}
+        self.mock_client.get.return_value = json.dumps(status)
+        
+        self.connector.get_intersection_status("test-intersection-1")["signals"].clear()
+        
+        self.assertEqual(self.connector.get_intersection_status("test-intersection-1"), status)
+        self.mock_client.get.assert_called_once()
+    
+    def test_get_intersection_status_not_cached_across_write(self):
+        """Test a status fetched while it is being rewritten is not cached"""
+        key = "intersection:test-intersection-1:status"
+        
+        def get_racing_write(requested_key):
+            self.connector.set_value(key, {"version": 2})
+            return json.dumps({"version": 1})
+            
+        self.mock_client.get.side_effect = get_racing_write
+        self.assertEqual(self.connector.get_intersection_status("test-intersection-1"), {"version": 1})
+        
+        self.mock_client.get.side_effect = None
+        self.mock_client.get.return_value = json.dumps({"version": 2})
+        self.assertEqual(self.connector.get_intersection_status("test-intersection-1"), {"version": 2})
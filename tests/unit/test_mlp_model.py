@@ -0,0 +1,139 @@
+"""
+Unit tests for the MLP traffic prediction model
+"""
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("tensorflow")
+pytest.importorskip("sklearn")
+
+from backend.ml.prediction.mlp_model import INFERENCE_BATCH, PredictionBatcher, TrafficPredictionMLP
+
+_INPUT_DIM = 4
+
+
+class _SumModel:
+    """Stand-in model predicting the sum of each sample's features"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, X):
+        self.batch_sizes.append(len(X))
+        return X.sum(axis=1)
+
+
+@pytest.fixture(scope="module")
+def mlp():
+    """Built model with a scaler fitted on random data"""
+    model = TrafficPredictionMLP(input_dim=_INPUT_DIM, hidden_layers=[60, 30])
+    model.build_model()
+    model.scaler.fit(np.random.default_rng(0).normal(size=(100, _INPUT_DIM)))
+    return model
+
+
+def test_build_model_keeps_hidden_layers(mlp):
+    """Test build_model rounds layer widths without changing the configuration"""
+    assert mlp.hidden_layers == [60, 30]
+
+    dense_units = [layer.units for layer in mlp.model.layers if hasattr(layer, "units")]
+    assert dense_units == [64, 32, 1]
+
+
+@pytest.mark.parametrize("n_samples", [1, INFERENCE_BATCH, INFERENCE_BATCH + 1, 3 * INFERENCE_BATCH - 5])
+def test_predict_pads_and_trims(mlp, n_samples):
+    """Test predict pads to whole batches and returns one row per sample"""
+    X = np.random.default_rng(n_samples).normal(size=(n_samples, _INPUT_DIM))
+
+    result = mlp.predict(X)
+
+    expected = mlp.model(mlp.scaler.transform(X).astype(np.float32), training=False).numpy()
+    assert result.shape == (n_samples, 1)
+    np.testing.assert_allclose(result, expected, rtol=1e-4, atol=1e-5)
+    assert mlp._infer.experimental_get_tracing_count() == 1
+
+
+def test_batcher_resolves_futures():
+    """Test submitted samples are predicted together and resolved in order"""
+    model = _SumModel()
+    batcher = PredictionBatcher(model, max_wait_ms=50)
+
+    futures = [batcher.submit([i, i, 0, 0]) for i in range(3)]
+    results = [future.result(timeout=2.0) for future in futures]
+    batcher.close()
+
+    assert results == [0, 2, 4]
+    assert sum(model.batch_sizes) == 3
+    assert max(model.batch_sizes) <= INFERENCE_BATCH
+
+
+def test_batcher_fails_futures_on_model_error():
+    """Test a model error is set on every future in the batch"""
+    class FailingModel:
+        def predict(self, X):
+            raise ValueError("bad input")
+
+    batcher = PredictionBatcher(FailingModel())
+
+    future = batcher.submit([0, 0, 0, 0])
+
+    with pytest.raises(ValueError):
+        future.result(timeout=2.0)
+    batcher.close()
+
+
+def test_batcher_skips_cancelled_requests():
+    """Test a request cancelled by its caller does not stop the worker"""
+    entered = threading.Event()
+    release = threading.Event()
+
+    class BlockingModel(_SumModel):
+        def predict(self, X):
+            entered.set()
+            release.wait(timeout=2.0)
+            return super().predict(X)
+
+    model = BlockingModel()
+    batcher = PredictionBatcher(model, max_wait_ms=1)
+    in_flight = batcher.submit([1, 0, 0, 0])
+    assert entered.wait(timeout=2.0)
+    cancelled = batcher.submit([2, 0, 0, 0])
+    kept = batcher.submit([3, 0, 0, 0])
+
+    assert cancelled.cancel()
+    assert not in_flight.cancel()
+    release.set()
+
+    assert in_flight.result(timeout=2.0) == 1
+    assert kept.result(timeout=2.0) == 3
+    assert batcher.submit([4, 0, 0, 0]).result(timeout=2.0) == 4
+    assert sum(model.batch_sizes) == 3
+    batcher.close()
+
+
+def test_batcher_close_cancels_queued_requests():
+    """Test close cancels queued futures and rejects new submissions"""
+    entered = threading.Event()
+    release = threading.Event()
+
+    class BlockingModel(_SumModel):
+        def predict(self, X):
+            entered.set()
+            release.wait(timeout=2.0)
+            return super().predict(X)
+
+    batcher = PredictionBatcher(BlockingModel(), max_wait_ms=1)
+    in_flight = batcher.submit([1, 0, 0, 0])
+    assert entered.wait(timeout=2.0)
+    queued = batcher.submit([2, 0, 0, 0])
+
+    # Let the in-flight batch finish only after close has stopped the worker
+    threading.Timer(0.05, release.set).start()
+    batcher.close()
+
+    assert in_flight.result(timeout=2.0) == 1
+    assert queued.cancelled()
+    with pytest.raises(RuntimeError):
+        batcher.submit([3, 0, 0, 0])